@@ -3,27 +3,73 @@
 자연어로 비용 데이터를 조회하는 채팅 인터페이스
 """
 
+import atexit
+import codecs
+import csv
+import functools
+import io
 import os
 import sys
+import tempfile
+import time
+import uuid
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from types import MappingProxyType
 
 import streamlit as st
-import pandas as pd
 from dotenv import load_dotenv
 
 # 프로젝트 루트를 path에 추가
 sys.path.insert(0, str(Path(__file__).parent))
 
 from src.agent.agent import TextToSqlAgent
-from src.agent.tools import init_handler, close_handler, get_handler
+from src.agent.tools import ToolHandler, set_handler, get_handler
+from src.sql.result import ColumnarRows
 
 
 # =============================================================================
 # 설정
 # =============================================================================
 
+# 스트리밍 출력 갱신 주기 (초) 및 최소 텍스트 배치 크기 (글자 수)
+STREAM_FLUSH_INTERVAL_SEC = 0.05
+STREAM_FLUSH_MIN_CHARS = 8
+
+# 스트리밍 중 화면에 유지할 최대 Tool 호출 수
+STREAM_MAX_TOOL_CALLS = 50
+
+# session_state에 남길 쿼리 결과 미리보기 행 수 (전체 데이터는 디스크에 저장)
+PREVIEW_ROWS = 10
+
+# 기본으로 렌더링할 최근 채팅 메시지 수 (이전 메시지는 토글 시에만 렌더링)
+HISTORY_WINDOW = 20
+
+# Tool 호출 표시 아이콘 및 SQL 미리보기 길이
+TOOL_ICONS = MappingProxyType({
+    "list_tables": "📋",
+    "get_schema_info": "🔍",
+    "search_schema": "🔎",
+    "get_join_hint": "🔗",
+    "get_schema_bundle": "📦",
+    "get_optimal_join_path": "🛤️",
+    "validate_sql": "✅",
+    "execute_sql": "▶️",
+    "export_csv": "💾",
+})
+SQL_PREVIEW_CHARS = 100
+
+# CSV 다운로드 병렬 생성 최대 워커 수
+CSV_MAX_WORKERS = 8
+
+# 모드 변경/재초기화 중복 클릭 무시 시간 (초)
+MODE_CHANGE_DEBOUNCE_SEC = 2.0
+
+
+@st.cache_data(ttl=None, show_spinner=False)
 def load_config():
-    """환경변수에서 설정 로드"""
+    """환경변수에서 설정 로드 (프로세스당 1회, 이후 캐시)"""
     load_dotenv()
 
     return {
@@ -42,6 +88,13 @@ def load_config():
     }
 
 
+@functools.cache
+def lazy_pd():
+    """pandas 지연 로드 (미리보기 DataFrame 생성 시점까지 import 지연)"""
+    import pandas as pd
+    return pd
+
+
 # =============================================================================
 # 페이지 설정
 # =============================================================================
@@ -53,8 +106,8 @@ st.set_page_config(
     initial_sidebar_state="expanded",
 )
 
-# 커스텀 CSS
-st.markdown("""
+# 커스텀 CSS (rerun마다 다시 주입해야 스타일이 유지되므로 문자열만 상수화)
+CUSTOM_CSS = """
 <style>
     .stChatMessage {
         padding: 1rem;
@@ -80,7 +133,7 @@ st.markdown("""
         color: #1f77b4;
     }
 </style>
-""", unsafe_allow_html=True)
+"""
 
 
 # =============================================================================
@@ -101,24 +154,52 @@ def init_session_state():
         st.session_state.last_result = None
     if "tables_cache" not in st.session_state:
         st.session_state.tables_cache = None
+    if "is_streaming" not in st.session_state:
+        st.session_state.is_streaming = False
+    if "csv_cache" not in st.session_state:
+        st.session_state.csv_cache = {}
+    if "result_dir" not in st.session_state:
+        st.session_state.result_dir = tempfile.mkdtemp(prefix="text_to_sql_")
+
+
+@st.cache_resource(show_spinner=False)
+def build_handler(
+    context_method: str,
+    metadata_path: str,
+    db_config: dict,
+    output_dir: str,
+) -> ToolHandler:
+    """
+    ToolHandler 생성 (rerun/모드 변경 간 캐시)
+
+    YAML 파싱과 그래프 구축은 (모드, 메타데이터 경로, DB 설정, 출력 경로)
+    조합마다 한 번만 수행됩니다.
+
+    캐시된 핸들러는 모든 세션이 공유하므로 모드 변경 시 닫지 않고,
+    프로세스 종료 시에만 닫습니다. (닫으면 연결 풀/검증 캐시를 다시 쓸 수 없음)
+    """
+    handler = ToolHandler(
+        context_method=context_method,
+        metadata_path=metadata_path,
+        db_config=db_config,
+        output_dir=output_dir,
+    )
+    atexit.register(handler.close)
+    return handler
 
 
 def initialize_agent(context_method: str, config: dict):
     """Agent 초기화"""
     try:
-        # 기존 핸들러 정리
-        try:
-            close_handler()
-        except:
-            pass
-
-        # 새 핸들러 초기화
-        init_handler(
-            context_method=context_method,
-            metadata_path=config["metadata_path"],
-            db_config=config["db_config"],
-            output_dir=config["output_dir"],
+        # 캐시된 핸들러 등록 (기존 핸들러는 다른 세션이 사용 중일 수 있으므로 닫지 않음)
+        handler = build_handler(
+            context_method,
+            config["metadata_path"],
+            config["db_config"],
+            config["output_dir"],
         )
+        set_handler(handler)
+        st.session_state.tables_cache = handler.list_tables()
 
         # Agent 생성
         agent = TextToSqlAgent(
@@ -133,109 +214,298 @@ def initialize_agent(context_method: str, config: dict):
         return None
 
 
+# =============================================================================
+# 쿼리 결과 저장 / CSV 다운로드
+# =============================================================================
+
+def offload_query_data(result: dict) -> dict:
+    """
+    쿼리 결과 전체 데이터를 Arrow(feather) 파일로 저장하고 미리보기만 남긴 결과 반환
+
+    session_state에는 미리보기(PREVIEW_ROWS건)와 파일 경로만 유지되어
+    결과가 커도 rerun 비용이 늘지 않습니다.
+    Arrow 변환이 불가능하거나 파일 저장에 실패하면(디스크 부족 등) 기존처럼 메모리에 유지합니다.
+    """
+    # pyarrow는 쿼리 완료 후에만 필요하므로 첫 결과 저장 시점까지 import 지연
+    import pyarrow as pa
+    import pyarrow.feather as feather
+
+    result_dir = Path(st.session_state.result_dir)
+    queries = []
+
+    for query in result["queries"]:
+        query = dict(query)
+        data = query.get("data") or []
+        query["data_path"] = None
+
+        if data:
+            path = result_dir / f"query_{uuid.uuid4().hex}.feather"
+            try:
+                table = data.to_arrow() if isinstance(data, ColumnarRows) else pa.Table.from_pylist(data)
+                feather.write_feather(table, str(path))
+                query["data_path"] = str(path)
+                query["data"] = data[:PREVIEW_ROWS]
+            except (pa.ArrowException, OSError):
+                # 쓰다 만 파일 정리 (정리 실패는 무시, 데이터는 메모리에 유지)
+                try:
+                    path.unlink(missing_ok=True)
+                except OSError:
+                    pass
+
+        queries.append(query)
+
+    return {**result, "queries": queries}
+
+
+def clear_result_files():
+    """이전 결과의 feather 파일 삭제"""
+    last_result = st.session_state.get("last_result")
+    if not last_result:
+        return
+
+    for query in last_result.get("queries", []):
+        if query.get("data_path"):
+            Path(query["data_path"]).unlink(missing_ok=True)
+
+
+def query_to_csv_bytes(query: dict) -> bytes:
+    """
+    쿼리 결과를 CSV 바이트로 변환
+
+    DataFrame을 거치지 않고 Arrow CSV writer(디스크 저장 결과) 또는
+    csv.DictWriter(메모리 결과)로 직접 기록합니다.
+    session_state에 접근하지 않으므로 워커 스레드에서 호출할 수 있습니다.
+    """
+    buf = io.BytesIO()
+    buf.write(codecs.BOM_UTF8)  # Excel 호환 (utf-8-sig)
+
+    if query.get("data_path"):
+        import pyarrow.csv as pa_csv
+        import pyarrow.feather as feather
+
+        pa_csv.write_csv(feather.read_table(query["data_path"]), buf)
+    else:
+        text = io.TextIOWrapper(buf, encoding="utf-8", newline="")
+        writer = csv.DictWriter(text, fieldnames=list(query["data"][0].keys()))
+        writer.writeheader()
+        writer.writerows(query["data"])
+        text.flush()
+        text.detach()
+
+    return buf.getvalue()
+
+
+def get_csv_bytes_many(queries: list) -> list:
+    """
+    여러 쿼리 결과의 CSV 바이트 반환 (rerun 간 캐시, 미생성분은 병렬 생성)
+
+    last_result가 바뀔 때 csv_cache를 비우므로 id(query)를 키로 사용합니다.
+    """
+    cache = st.session_state.csv_cache
+    missing = [q for q in queries if id(q) not in cache]
+
+    if len(missing) == 1:
+        cache[id(missing[0])] = query_to_csv_bytes(missing[0])
+    elif missing:
+        with ThreadPoolExecutor(max_workers=min(CSV_MAX_WORKERS, len(missing))) as executor:
+            for query, data in zip(missing, executor.map(query_to_csv_bytes, missing)):
+                cache[id(query)] = data
+
+    return [cache[id(q)] for q in queries]
+
+
 # =============================================================================
 # 사이드바
 # =============================================================================
 
+def mode_change_in_flight() -> bool:
+    """모드 변경 후 MODE_CHANGE_DEBOUNCE_SEC 이내인지 여부 (재초기화 중복 방지)"""
+    ts = st.session_state.get("mode_change_ts")
+    return ts is not None and time.monotonic() - ts < MODE_CHANGE_DEBOUNCE_SEC
+
+
+@st.fragment
 def render_sidebar(config: dict):
-    """사이드바 렌더링"""
-    with st.sidebar:
-        st.title("⚙️ 설정")
-
-        # 모드 선택 (초기화 전에만 변경 가능)
-        st.subheader("Context 모드")
-
-        if not st.session_state.initialized:
-            context_method = st.radio(
-                "스키마 조회 방식을 선택하세요:",
-                options=["yaml", "graph"],
-                index=0,
-                format_func=lambda x: "📄 YAML (메타데이터)" if x == "yaml" else "🔗 Graph (NetworkX)",
-                help="YAML: 메타데이터 파일 기반 | Graph: NetworkX 그래프 탐색 기반"
-            )
+    """
+    사이드바 렌더링 (fragment)
 
-            if st.button("시작하기", type="primary", use_container_width=True):
-                with st.spinner("Agent 초기화 중..."):
-                    agent = initialize_agent(context_method, config)
-                    if agent:
-                        st.session_state.agent = agent
-                        st.session_state.context_method = context_method
-                        st.session_state.initialized = True
-                        st.session_state.messages = [{
-                            "role": "assistant",
-                            "content": f"**{context_method.upper()}** 모드로 text to sql이 시작되었습니다.\n\n"
-                        }]
-                        st.rerun()
-        else:
-            st.info(f"현재 모드: **{st.session_state.context_method.upper()}**")
-
-            if st.button("🔄 모드 변경", use_container_width=True):
-                st.session_state.initialized = False
-                st.session_state.agent = None
-                st.session_state.messages = []
-                st.session_state.last_result = None
-                st.session_state.tables_cache = None
+    사이드바 위젯 조작 시 사이드바만 다시 실행되어 채팅 히스토리를 다시 그리지 않습니다.
+    st.sidebar 컨텍스트 안에서 호출해야 합니다.
+    """
+    st.title("⚙️ 설정")
+
+    # 모드 선택 (초기화 전에만 변경 가능)
+    st.subheader("Context 모드")
+
+    if not st.session_state.initialized:
+        context_method = st.radio(
+            "스키마 조회 방식을 선택하세요:",
+            options=["yaml", "graph"],
+            index=0,
+            format_func=lambda x: "📄 YAML (메타데이터)" if x == "yaml" else "🔗 Graph (NetworkX)",
+            help="YAML: 메타데이터 파일 기반 | Graph: NetworkX 그래프 탐색 기반"
+        )
+
+        # 모드 변경 직후의 중복 클릭(더블 클릭)은 무시
+        if st.button("시작하기", type="primary", use_container_width=True) and not mode_change_in_flight():
+            with st.spinner("Agent 초기화 중..."):
+                agent = initialize_agent(context_method, config)
+                if agent:
+                    st.session_state.mode_change_ts = None
+                    st.session_state.agent = agent
+                    st.session_state.context_method = context_method
+                    st.session_state.initialized = True
+                    st.session_state.messages = [{
+                        "role": "assistant",
+                        "content": f"**{context_method.upper()}** 모드로 text to sql이 시작되었습니다.\n\n"
+                    }]
+                    st.rerun()
+    else:
+        st.info(f"현재 모드: **{st.session_state.context_method.upper()}**")
+
+        # 테이블 목록 (초기화 시 캐시된 값 사용)
+        tables = st.session_state.tables_cache or []
+        with st.expander(f"📋 테이블 목록 ({len(tables)}개)", expanded=False):
+            for t in tables:
+                st.markdown(f"- `{t['name']}`: {t['description']}")
+
+        if st.button("🔄 모드 변경", use_container_width=True) and not mode_change_in_flight():
+            st.session_state.mode_change_ts = time.monotonic()
+
+            # Agent 영속 연결 종료
+            if st.session_state.agent is not None:
                 try:
-                    close_handler()
+                    st.session_state.agent.close()
                 except:
                     pass
-                st.rerun()
+            st.session_state.initialized = False
+            st.session_state.agent = None
+            st.session_state.messages = []
+            clear_result_files()
+            st.session_state.last_result = None
+            st.session_state.csv_cache = {}
+            st.session_state.tables_cache = None
+            st.rerun()
+
+    st.divider()
+
+    # Graph 시각화 버튼 (Graph 모드일 때만)
+    if st.session_state.initialized and st.session_state.context_method == "graph":
+        st.subheader("🔗 스키마 그래프")
+
+        if st.button("그래프 DB UI HTML 다운", use_container_width=True):
+            try:
+                handler = get_handler()
+                output_path = handler.context.visualize(open_browser=False)
+
+                # HTML 파일 읽기
+                with open(output_path, "r", encoding="utf-8") as f:
+                    html_content = f.read()
+
+                # 다운로드 버튼 제공
+                st.download_button(
+                    label="📥 schema_graph.html 다운로드",
+                    data=html_content,
+                    file_name="schema_graph.html",
+                    mime="text/html",
+                    use_container_width=True,
+                )
+
+                st.info("다운로드 후 브라우저에서 열어보세요!")
+            except Exception as e:
+                st.error(f"시각화 실패: {e}")
 
         st.divider()
 
-        # Graph 시각화 버튼 (Graph 모드일 때만)
-        if st.session_state.initialized and st.session_state.context_method == "graph":
-            st.subheader("🔗 스키마 그래프")
+    # CSV 다운로드 (결과가 있을 때만)
+    if st.session_state.last_result and st.session_state.last_result.get("queries"):
+        st.subheader("📥 데이터 내보내기")
+
+        downloads = [
+            (i, query)
+            for i, query in enumerate(st.session_state.last_result["queries"])
+            if query.get("data")
+        ]
+        csv_list = get_csv_bytes_many([query for _, query in downloads])
+
+        for (i, query), csv_bytes in zip(downloads, csv_list):
+            st.download_button(
+                label=f"CSV 다운로드 ({query['row_count']}건)",
+                data=csv_bytes,
+                file_name=f"query_result_{i+1}.csv",
+                mime="text/csv",
+                use_container_width=True,
+            )
+
+    st.divider()
 
-            if st.button("그래프 DB UI HTML 다운", use_container_width=True):
-                try:
-                    handler = get_handler()
-                    output_path = handler.context.visualize(open_browser=False)
-
-                    # HTML 파일 읽기
-                    with open(output_path, "r", encoding="utf-8") as f:
-                        html_content = f.read()
-
-                    # 다운로드 버튼 제공
-                    st.download_button(
-                        label="📥 schema_graph.html 다운로드",
-                        data=html_content,
-                        file_name="schema_graph.html",
-                        mime="text/html",
-                        use_container_width=True,
-                    )
-
-                    st.info("다운로드 후 브라우저에서 열어보세요!")
-                except Exception as e:
-                    st.error(f"시각화 실패: {e}")
-
-            st.divider()
-
-        # CSV 다운로드 (결과가 있을 때만)
-        if st.session_state.last_result and st.session_state.last_result.get("queries"):
-            st.subheader("📥 데이터 내보내기")
-
-            for i, query in enumerate(st.session_state.last_result["queries"]):
-                if query.get("data"):
-                    df = pd.DataFrame(query["data"])
-                    csv = df.to_csv(index=False, encoding="utf-8-sig")
-
-                    st.download_button(
-                        label=f"CSV 다운로드 ({len(query['data'])}건)",
-                        data=csv,
-                        file_name=f"query_result_{i+1}.csv",
-                        mime="text/csv",
-                        use_container_width=True,
-                    )
 
-        st.divider()
 
+# =============================================================================
+# 스트리밍 렌더링
+# =============================================================================
+
+def render_tool_call(tool_name: str, tool_input: dict):
+    """Tool 호출 한 건 표시"""
+    tool_icon = TOOL_ICONS.get(tool_name, "🔧")
+
+    # 간략한 입력 표시
+    if tool_name == "execute_sql":
+        sql = tool_input.get("sql", "")
+        sql_preview = sql[:SQL_PREVIEW_CHARS] + ("..." if len(sql) > SQL_PREVIEW_CHARS else "")
+        st.markdown(f"{tool_icon} **{tool_name}**")
+        st.code(sql_preview, language="sql")
+    elif tool_name == "get_schema_info":
+        st.markdown(f"{tool_icon} **{tool_name}**: `{tool_input.get('table_name', '')}`")
+    elif tool_name == "get_schema_bundle":
+        tables = tool_input.get("tables", [])
+        st.markdown(f"{tool_icon} **{tool_name}**: `{', '.join(tables)}`")
+    elif tool_name == "get_optimal_join_path":
+        tables = tool_input.get("tables", [])
+        st.markdown(f"{tool_icon} **{tool_name}**: `{' → '.join(tables)}`")
+    elif tool_name == "validate_sql":
+        st.markdown(f"{tool_icon} **{tool_name}**: SQL 검증 중...")
+    else:
+        st.markdown(f"{tool_icon} **{tool_name}**: {tool_input}")
+
+
+def render_tool_calls(placeholder, tool_calls):
+    """누적된 Tool 호출 목록을 placeholder에 한 번에 다시 그리기"""
+    with placeholder.container():
+        for call in tool_calls:
+            render_tool_call(call["name"], call["input"])
 
 
 # =============================================================================
 # 메인 채팅 영역
 # =============================================================================
 
+def render_message(message: dict):
+    """채팅 히스토리 메시지 한 건 렌더링"""
+    with st.chat_message(message["role"]):
+        st.markdown(message["content"])
+
+        # 모든 쿼리 표시 (디버그용)
+        if message.get("all_queries"):
+            with st.expander(f"🔍 실행된 SQL 쿼리 ({len(message['all_queries'])}개)", expanded=False):
+                for i, query in enumerate(message["all_queries"], 1):
+                    st.markdown(f"**쿼리 {i}** {'✅' if query['success'] else '❌'}")
+                    st.code(query["sql"], language="sql")
+                    if query["success"]:
+                        st.caption(f"결과: {query['row_count']}건")
+                    else:
+                        st.error(f"에러: {query.get('error', 'Unknown error')}")
+                    if i < len(message["all_queries"]):
+                        st.divider()
+
+        # 데이터 테이블 표시
+        if message.get("data_preview"):
+            with st.expander("📊 데이터 미리보기", expanded=True):
+                if "_df" not in message:
+                    message["_df"] = lazy_pd().DataFrame(message["data_preview"])
+                st.dataframe(message["_df"], use_container_width=True)
+
+
 def render_chat():
     """채팅 영역 렌더링"""
     st.title("text to sql POC")
@@ -259,29 +529,18 @@ def render_chat():
             """)
         return
 
-    # 메시지 히스토리 표시
-    for message in st.session_state.messages:
-        with st.chat_message(message["role"]):
-            st.markdown(message["content"])
-
-            # 모든 쿼리 표시 (디버그용)
-            if message.get("all_queries"):
-                with st.expander(f"🔍 실행된 SQL 쿼리 ({len(message['all_queries'])}개)", expanded=False):
-                    for i, query in enumerate(message["all_queries"], 1):
-                        st.markdown(f"**쿼리 {i}** {'✅' if query['success'] else '❌'}")
-                        st.code(query["sql"], language="sql")
-                        if query["success"]:
-                            st.caption(f"결과: {query['row_count']}건")
-                        else:
-                            st.error(f"에러: {query.get('error', 'Unknown error')}")
-                        if i < len(message["all_queries"]):
-                            st.divider()
-
-            # 데이터 테이블 표시
-            if message.get("data_preview"):
-                with st.expander("📊 데이터 미리보기", expanded=True):
-                    df = pd.DataFrame(message["data_preview"])
-                    st.dataframe(df, use_container_width=True)
+    # 메시지 히스토리 표시 (최근 HISTORY_WINDOW개만 기본 렌더링)
+    messages = st.session_state.messages
+    older_count = len(messages) - HISTORY_WINDOW
+
+    if older_count > 0:
+        if st.toggle(f"이전 메시지 {older_count}개 보기", key="show_older_messages"):
+            for message in messages[:older_count]:
+                render_message(message)
+        messages = messages[older_count:]
+
+    for message in messages:
+        render_message(message)
 
     # 채팅 입력
     if prompt := st.chat_input("질문을 입력하세요...", key="chat_input"):
@@ -292,66 +551,75 @@ def render_chat():
             st.markdown(prompt)
 
         # Agent 실행 (스트리밍)
+        final_result = None
+
         with st.chat_message("assistant"):
             try:
                 # 진행 상황 표시 영역
                 status_placeholder = st.empty()
-                progress_container = st.container()
+                progress_placeholder = st.empty()
+                text_placeholder = st.empty()
 
-                tool_calls = []  # Tool 호출 기록
-                final_result = None
+                # Tool 호출 기록 (최근 항목만 유지하여 렌더링 비용 제한)
+                tool_calls = deque(maxlen=STREAM_MAX_TOOL_CALLS)
                 text_parts = []
 
+                # 렌더링 배치 상태 (일정 주기로만 위젯 갱신)
+                last_flush_ts = 0.0
+                pending_chars = 0
+                pending_status = None  # 중간 상태 메시지는 마지막 것만 표시
+                tools_dirty = False
+
+                # 스트리밍 중에는 markdown 파싱 없이 plain text로만 표시
+                st.session_state.is_streaming = True
+
                 # 스트리밍 실행
                 for event in st.session_state.agent.run_streaming(prompt):
                     if event["type"] == "status":
-                        status_placeholder.info(event["message"])
+                        pending_status = event["message"]
 
                     elif event["type"] == "tool_call":
-                        tool_name = event["name"]
-                        tool_input = event["input"]
-                        tool_calls.append({"name": tool_name, "input": tool_input})
-
-                        # Tool 호출 표시
-                        with progress_container:
-                            tool_icon = {
-                                "list_tables": "📋",
-                                "get_schema_info": "🔍",
-                                "search_schema": "🔎",
-                                "get_join_hint": "🔗",
-                                "get_optimal_join_path": "🛤️",
-                                "validate_sql": "✅",
-                                "execute_sql": "▶️",
-                                "export_csv": "💾",
-                            }.get(tool_name, "🔧")
-
-                            # 간략한 입력 표시
-                            if tool_name == "execute_sql":
-                                sql_preview = tool_input.get("sql", "")[:100]
-                                if len(tool_input.get("sql", "")) > 100:
-                                    sql_preview += "..."
-                                st.markdown(f"{tool_icon} **{tool_name}**")
-                                st.code(sql_preview, language="sql")
-                            elif tool_name == "get_schema_info":
-                                st.markdown(f"{tool_icon} **{tool_name}**: `{tool_input.get('table_name', '')}`")
-                            elif tool_name == "get_optimal_join_path":
-                                tables = tool_input.get("tables", [])
-                                st.markdown(f"{tool_icon} **{tool_name}**: `{' → '.join(tables)}`")
-                            elif tool_name == "validate_sql":
-                                st.markdown(f"{tool_icon} **{tool_name}**: SQL 검증 중...")
-                            else:
-                                st.markdown(f"{tool_icon} **{tool_name}**: {tool_input}")
+                        tool_calls.append({"name": event["name"], "input": event["input"]})
+                        tools_dirty = True
 
                     elif event["type"] == "text":
                         text_parts.append(event["content"])
+                        pending_chars += len(event["content"])
 
                     elif event["type"] == "done":
                         final_result = event["result"]
+                        st.session_state.is_streaming = False
+                        pending_status = None
                         status_placeholder.empty()  # 상태 메시지 제거
+                        text_placeholder.empty()  # 최종 답변(markdown)으로 대체
+
+                    # 텍스트 변경분만 모아 일정 주기로 렌더링
+                    # (status / tool_call은 드물고 바로 뒤에 긴 Tool 실행이 올 수 있으므로 즉시 반영)
+                    now = time.monotonic()
+                    if event["type"] == "text" and now - last_flush_ts < STREAM_FLUSH_INTERVAL_SEC:
+                        continue
+                    if pending_status is not None:
+                        status_placeholder.info(pending_status)
+                        pending_status = None
+                    if tools_dirty:
+                        render_tool_calls(progress_placeholder, tool_calls)
+                        tools_dirty = False
+                    if pending_chars >= STREAM_FLUSH_MIN_CHARS and st.session_state.is_streaming:
+                        text_placeholder.code("\n".join(text_parts), language=None)
+                        pending_chars = 0
+                    last_flush_ts = now
+
+                # 마지막 배치 반영
+                if tools_dirty:
+                    render_tool_calls(progress_placeholder, tool_calls)
 
                 # 최종 결과 처리
                 if final_result:
+                    # 전체 데이터는 디스크로, session_state에는 미리보기만 유지
+                    final_result = offload_query_data(final_result)
+                    clear_result_files()
                     st.session_state.last_result = final_result
+                    st.session_state.csv_cache = {}
 
                     # 응답 메시지 구성
                     response_message = {
@@ -363,39 +631,16 @@ def render_chat():
                     if final_result["queries"]:
                         response_message["all_queries"] = final_result["queries"]
 
-                        # 마지막 성공 쿼리의 데이터 미리보기 (최대 10건)
+                        # 마지막 성공 쿼리의 데이터 미리보기 (최대 PREVIEW_ROWS건)
                         for query in reversed(final_result["queries"]):
                             if query.get("success") and query.get("data"):
-                                response_message["data_preview"] = query["data"][:10]
+                                response_message["data_preview"] = query["data"][:PREVIEW_ROWS]
+                                # DataFrame은 한 번만 생성하여 rerun 간 재사용
+                                response_message["_df"] = lazy_pd().DataFrame(response_message["data_preview"])
                                 break
 
                     st.session_state.messages.append(response_message)
 
-                    # 구분선
-                    st.divider()
-
-                    # 응답 표시
-                    st.markdown("### 📝 답변")
-                    st.markdown(response_message["content"])
-
-                    # 모든 실행된 쿼리 표시 (디버그용)
-                    if response_message.get("all_queries"):
-                        with st.expander(f"🔍 실행된 SQL 쿼리 ({len(response_message['all_queries'])}개)", expanded=False):
-                            for i, query in enumerate(response_message["all_queries"], 1):
-                                st.markdown(f"**쿼리 {i}** {'✅' if query['success'] else '❌'}")
-                                st.code(query["sql"], language="sql")
-                                if query["success"]:
-                                    st.caption(f"결과: {query['row_count']}건")
-                                else:
-                                    st.error(f"에러: {query.get('error', 'Unknown error')}")
-                                if i < len(response_message["all_queries"]):
-                                    st.divider()
-
-                    if response_message.get("data_preview"):
-                        with st.expander("📊 데이터 미리보기", expanded=True):
-                            df = pd.DataFrame(response_message["data_preview"])
-                            st.dataframe(df, use_container_width=True)
-
             except NotImplementedError as e:
                 error_msg = f"⚠️ 아직 구현되지 않은 기능입니다: {e}\n\nYAML 모드로 변경해주세요."
                 st.error(error_msg)
@@ -406,6 +651,13 @@ def render_chat():
                 st.error(error_msg)
                 st.session_state.messages.append({"role": "assistant", "content": error_msg})
 
+            finally:
+                st.session_state.is_streaming = False
+
+        # 완료된 답변은 히스토리 렌더링으로 한 번만 표시 (사이드바 다운로드도 갱신)
+        if final_result:
+            st.rerun()
+
 
 # =============================================================================
 # 메인
@@ -413,6 +665,8 @@ def render_chat():
 
 def main():
     """메인 함수"""
+    st.markdown(CUSTOM_CSS, unsafe_allow_html=True)
+
     init_session_state()
     config = load_config()
 
@@ -427,7 +681,8 @@ def main():
         st.stop()
 
     # UI 렌더링
-    render_sidebar(config)
+    with st.sidebar:
+        render_sidebar(config)
     render_chat()
 
 
@@ -16,9 +16,6 @@ from dotenv import load_dotenv
 # 프로젝트 루트를 path에 추가
 sys.path.insert(0, str(Path(__file__).parent))
 
-from src.agent.agent import TextToSqlAgent
-from src.agent.tools import init_handler, close_handler
-
 
 def load_config():
     """환경변수에서 설정 로드"""
@@ -99,6 +96,10 @@ def main():
 
     args = parser.parse_args()
 
+    # Agent SDK/pandas/networkx 등 무거운 모듈은 인자 파싱 후 로드 (--help 즉시 응답)
+    from src.agent.agent import TextToSqlAgent
+    from src.agent.tools import init_handler, close_handler
+
     # 설정 로드
     config = load_config()
 
@@ -126,6 +127,8 @@ def main():
         print(f"  - 출력 디렉토리: {args.output_dir}")
         print()
 
+    agent = None
+
     try:
         # Tool 핸들러 초기화
         init_handler(
@@ -150,6 +153,9 @@ def main():
             print(f"질문: {args.question}\n")
             print("처리 중...\n")
 
+            # 질문 1개만 처리하므로 연결 전에 질문과 무관한 프롬프트 섹션 제외
+            # (agent의 빌더는 기본 템플릿의 복사본이므로 다른 인스턴스에 영향 없음)
+            agent.prompt_builder.specialize_for_query(args.question)
             result = agent.run(args.question)
 
             # 실행된 쿼리 출력
@@ -190,6 +196,8 @@ def main():
         sys.exit(1)
 
     finally:
+        if agent is not None:
+            agent.close()
         close_handler()
 
 
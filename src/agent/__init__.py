@@ -1,36 +1,38 @@
-from .agent import TextToSqlAgent
-from .tools import (
-    create_text_to_sql_mcp_server,
-    MCP_TOOL_NAMES,
-    init_handler,
-    close_handler,
-)
-from .prompts import (
-    PromptBuilder,
-    create_default_prompt_builder,
-    create_minimal_prompt_builder,
-    SECTION_ROLE,
-    SECTION_WORKFLOW,
-    SECTION_RULES,
-    SECTION_RESPONSE_FORMAT,
-    SECTION_MART_TABLE_SELECTION,
-    SECTION_SHARD_TABLE_WORKFLOW,
-)
+# Cost Analytics Agent
+#
+# 하위 모듈은 실제로 이름에 접근할 때 로드합니다 (PEP 562).
+# prompts만 사용하는 경우 Agent SDK/pandas/networkx 등을 import하지 않습니다.
+from importlib import import_module
 
-__all__ = [
-    "TextToSqlAgent",
-    "create_text_to_sql_mcp_server",
-    "MCP_TOOL_NAMES",
-    "init_handler",
-    "close_handler",
+_EXPORTS = {
+    "TextToSqlAgent": ".agent",
+    "create_text_to_sql_mcp_server": ".tools",
+    "MCP_TOOL_NAMES": ".tools",
+    "init_handler": ".tools",
+    "close_handler": ".tools",
     # Prompt 관련
-    "PromptBuilder",
-    "create_default_prompt_builder",
-    "create_minimal_prompt_builder",
-    "SECTION_ROLE",
-    "SECTION_WORKFLOW",
-    "SECTION_RULES",
-    "SECTION_RESPONSE_FORMAT",
-    "SECTION_MART_TABLE_SELECTION",
-    "SECTION_SHARD_TABLE_WORKFLOW",
-]
+    "PromptBuilder": ".prompts",
+    "create_default_prompt_builder": ".prompts",
+    "build_default_prompt": ".prompts",
+    "create_minimal_prompt_builder": ".prompts",
+    "SECTION_ROLE": ".prompts",
+    "SECTION_WORKFLOW": ".prompts",
+    "SECTION_RULES": ".prompts",
+    "SECTION_RESPONSE_FORMAT": ".prompts",
+    "SECTION_MART_TABLE_SELECTION": ".prompts",
+    "SECTION_SHARD_TABLE_WORKFLOW": ".prompts",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(_EXPORTS[name], __name__), name)
+    globals()[name] = value  # 이후 접근은 모듈 속성으로 바로 조회
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
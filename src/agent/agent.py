@@ -1,6 +1,14 @@
 """Claude Agent SDK 기반 Cost Analytics Agent"""
 
+import dataclasses
+import io
+import time
+import weakref
+from contextlib import asynccontextmanager
+
 import anyio
+import orjson
+from anyio.from_thread import start_blocking_portal
 
 from claude_agent_sdk import (
     ClaudeSDKClient,
@@ -11,13 +19,110 @@ from claude_agent_sdk import (
     ToolUseBlock,
 )
 
-from .tools import create_text_to_sql_mcp_server, MCP_TOOL_NAMES, get_handler
-from .prompts import PromptBuilder, create_default_prompt_builder
+from .tools import (
+    create_text_to_sql_mcp_server,
+    MCP_TOOL_NAMES,
+    get_handler,
+    current_handler,
+)
+from .prompts import PromptBuilder, build_default_prompt, create_default_prompt_builder
+
+
+# MCP Tool 전체 이름 → 짧은 이름 (mcp__text_to_sql__xxx -> xxx)
+_TOOL_SHORT_NAMES = {name: name.rsplit("__", 1)[-1] for name in MCP_TOOL_NAMES}
+
+# run_streaming() 이벤트 버퍼 크기 및 무응답 타임아웃 (초)
+STREAM_BUFFER_SIZE = 16
+STREAM_IDLE_TIMEOUT_SEC = 120
+
+# 연속 텍스트 블록 병합 기준 (최대 글자 수 / 최대 대기 시간(초))
+TEXT_COALESCE_MAX_CHARS = 16384
+TEXT_COALESCE_WINDOW_SEC = 0.05
+
+
+async def _receive_event(receive_stream):
+    """스트림에서 이벤트 하나 수신 (STREAM_IDLE_TIMEOUT_SEC 동안 없으면 TimeoutError)"""
+    with anyio.fail_after(STREAM_IDLE_TIMEOUT_SEC):
+        return await receive_stream.receive()
+
+
+class _TextCoalescer:
+    """
+    연속된 텍스트 블록을 모아 하나의 text 이벤트 내용으로 병합
+
+    마지막 방출 후 TEXT_COALESCE_WINDOW_SEC가 지났으면 바로 방출하고,
+    그 안에 들어온 블록만 모읍니다. 모인 블록은 호출 측에서 AssistantMessage 끝마다
+    flush()하므로 다음 메시지(Tool 입력 생성 등)를 기다리며 지연되지 않습니다.
+    """
+
+    __slots__ = ("_parts", "_size", "_last_emit")
+
+    def __init__(self):
+        self._parts: list[str] = []
+        self._size = 0
+        self._last_emit = 0.0
+
+    def add(self, text: str) -> str | None:
+        """
+        텍스트 추가
+
+        Returns:
+            병합 기준(크기/시간)을 넘으면 방출할 내용, 아니면 None
+        """
+        self._parts.append(text)
+        self._size += len(text)
+
+        if (
+            self._size >= TEXT_COALESCE_MAX_CHARS
+            or time.monotonic() - self._last_emit >= TEXT_COALESCE_WINDOW_SEC
+        ):
+            return self.flush()
+        return None
+
+    def flush(self) -> str | None:
+        """모아둔 텍스트 반환 후 비움 (블록 구분은 줄바꿈으로 유지)"""
+        if not self._parts:
+            return None
+        content = "\n".join(self._parts)
+        self._parts = []
+        self._size = 0
+        self._last_emit = time.monotonic()
+        return content
+
+
+def _close_portal_client(client_cm, portal_cm):
+    """포털 소유 연결 및 이벤트 루프 종료 (close() 또는 agent GC/프로세스 종료 시)"""
+    try:
+        client_cm.__exit__(None, None, None)
+    finally:
+        portal_cm.__exit__(None, None, None)
+
+
+def _read_question() -> str:
+    """대화형 모드 질문 입력 (워커 스레드에서 실행)"""
+    return input("질문> ").strip()
 
 
 class TextToSqlAgent:
     """Cost Analytics SQL Agent - Claude Agent SDK 사용"""
 
+    __slots__ = (
+        "context_method",
+        "max_turns",
+        "max_validation_retries",
+        "mcp_server",
+        "_prompt_builder",
+        "_system_prompt",
+        "_options",
+        "_client",
+        "_client_cm",
+        "_portal",
+        "_portal_cm",
+        "_finalizer",
+        "_client_dirty",
+        "__weakref__",
+    )
+
     def __init__(
         self,
         context_method: str = "yaml",
@@ -39,28 +144,179 @@ class TextToSqlAgent:
         # MCP 서버 생성
         self.mcp_server = create_text_to_sql_mcp_server()
 
-        # 프롬프트 빌더 설정
-        if prompt_builder is None:
-            self.prompt_builder = create_default_prompt_builder(
-                context_method=context_method,
-                max_validation_retries=max_validation_retries,
+        # 프롬프트 빌더 설정 (None이면 기본 프롬프트를 캐시에서 사용)
+        self._prompt_builder = prompt_builder
+        self._system_prompt: str | None = None  # 첫 접근 시 빌드
+
+        # ClaudeAgentOptions 캐시 (_create_options()에서 생성)
+        self._options: ClaudeAgentOptions | None = None
+
+        # 영속 연결 상태 (open() 또는 async with 진입 후 유효)
+        self._client: ClaudeSDKClient | None = None
+        self._client_cm = None  # 포털 소유 연결의 동기 컨텍스트 매니저
+        self._portal = None  # 동기 호출용 전용 이벤트 루프
+        self._portal_cm = None
+        # agent가 close() 없이 버려져도(Streamlit 세션 종료 등) CLI 프로세스/포털 스레드 정리
+        self._finalizer = None
+        # 이전 응답을 끝까지 읽지 못한 연결 (다음 질문이 남은 메시지를 받지 않도록 재연결)
+        self._client_dirty = False
+
+    @property
+    def prompt_builder(self) -> PromptBuilder:
+        """프롬프트 빌더 (기본값은 접근 시점에 생성)"""
+        if self._prompt_builder is None:
+            self._prompt_builder = create_default_prompt_builder(
+                context_method=self.context_method,
+                max_validation_retries=self.max_validation_retries,
                 include_mart_rules=True,
             )
-        else:
-            self.prompt_builder = prompt_builder
+        return self._prompt_builder
+
+    @property
+    def system_prompt(self) -> str:
+        """시스템 프롬프트 (최초 접근 시 빌드, 기본 프롬프트는 인스턴스 간 공유)"""
+        if self._system_prompt is None:
+            if self._prompt_builder is None:
+                self._system_prompt = build_default_prompt(
+                    self.context_method,
+                    self.max_validation_retries,
+                    True,
+                )
+            else:
+                self._system_prompt = self._prompt_builder.build()
+        return self._system_prompt
+
+    # =========================================================================
+    # 연결 관리
+    # =========================================================================
+
+    def open(self) -> "TextToSqlAgent":
+        """
+        동기 호출용 영속 연결 생성
 
-        # 시스템 프롬프트 빌드
-        self.system_prompt = self.prompt_builder.build()
+        전용 이벤트 루프(BlockingPortal)를 띄우고 그 위에서 클라이언트를 한 번만 연결합니다.
+        이후 run()/run_streaming()은 같은 루프와 연결을 재사용하므로
+        질문마다 연결 수립/시스템 프롬프트 전송 비용이 들지 않습니다.
+        이전 응답을 끝까지 읽지 못한 연결은 닫고 새로 연결합니다.
+        """
+        if self._client_dirty:
+            self.close()
+
+        if self._portal is None:
+            self._portal_cm = start_blocking_portal()
+            self._portal = self._portal_cm.__enter__()
+            # 연결/해제가 같은 태스크에서 이루어지도록 포털에 컨텍스트 매니저를 위임
+            self._client_cm = self._portal.wrap_async_context_manager(
+                ClaudeSDKClient(options=self._create_options())
+            )
+            self._client = self._client_cm.__enter__()
+            self._finalizer = weakref.finalize(
+                self, _close_portal_client, self._client_cm, self._portal_cm
+            )
+        return self
+
+    def close(self):
+        """open()으로 생성한 영속 연결 및 이벤트 루프 종료"""
+        self._client_dirty = False
+        if self._portal is None:
+            return
+
+        finalizer = self._finalizer
+        self._client = None
+        self._client_cm = None
+        self._portal = None
+        self._portal_cm = None
+        self._finalizer = None
+        finalizer()  # 1회만 실행 (이후 GC/종료 시에는 호출되지 않음)
+
+    def __enter__(self):
+        return self.open()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    async def __aenter__(self):
+        """비동기 컨텍스트용 영속 연결 생성"""
+        if self._client is None:
+            client = ClaudeSDKClient(options=self._create_options())
+            await client.__aenter__()
+            self._client = client
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        # 포털 소유 연결은 close()에서 정리
+        if self._client is not None and self._portal is None:
+            client, self._client = self._client, None
+            await client.__aexit__(exc_type, exc_val, exc_tb)
+
+    @asynccontextmanager
+    async def _session(self, question: str | None = None):
+        """
+        영속 연결이 있으면 재사용, 없으면 1회용 연결 생성
+
+        Args:
+            question: 1회용 연결에서 처리할 질문 (있으면 질문에 맞춰 줄인 시스템 프롬프트 사용)
+        """
+        if self._client is not None and self._client_dirty and self._portal is None:
+            # async with로 만든 영속 연결이 이전 응답을 다 읽지 못했으면 새로 연결
+            stale, self._client = self._client, None
+            self._client_dirty = False
+            try:
+                await stale.__aexit__(None, None, None)
+            except Exception:
+                pass
+            client = ClaudeSDKClient(options=self._create_options())
+            await client.__aenter__()
+            self._client = client
+
+        if self._client is not None:
+            yield self._client
+            return
+
+        options = self._create_options()
+        if question is not None:
+            options = self._options_for_question(options, question)
+
+        async with ClaudeSDKClient(options=options) as client:
+            yield client
+
+    def _options_for_question(self, options: ClaudeAgentOptions, question: str) -> ClaudeAgentOptions:
+        """
+        질문과 무관한 섹션을 뺀 시스템 프롬프트로 옵션 복사본 생성 (1회용 연결 전용)
+
+        영속 연결은 시스템 프롬프트가 연결 단위로 고정되므로 사용하지 않습니다.
+        빌더 원본은 copy()로 보존하고, 프롬프트가 그대로면 캐시된 옵션을 반환합니다.
+        """
+        prompt = self.prompt_builder.copy().specialize_for_query(question).build()
+        if prompt == options.system_prompt:
+            return options
+        return dataclasses.replace(options, system_prompt=prompt)
 
     def _create_options(self) -> ClaudeAgentOptions:
-        """ClaudeAgentOptions 생성"""
-        return ClaudeAgentOptions(
-            system_prompt=self.system_prompt,
-            max_turns=self.max_turns,
-            mcp_servers={"text_to_sql": self.mcp_server},
-            allowed_tools=MCP_TOOL_NAMES,
-            permission_mode="acceptEdits",  # 도구 자동 실행
-        )
+        """ClaudeAgentOptions 반환 (인스턴스당 1회 생성 후 재사용)"""
+        if self._options is None:
+            self._options = ClaudeAgentOptions(
+                system_prompt=self.system_prompt,
+                max_turns=self.max_turns,
+                mcp_servers={"text_to_sql": self.mcp_server},
+                allowed_tools=MCP_TOOL_NAMES,
+                permission_mode="acceptEdits",  # 도구 자동 실행
+            )
+        return self._options
+
+    def set_max_turns(self, max_turns: int):
+        """
+        최대 대화 턴 수 변경
+
+        캐시된 ClaudeAgentOptions를 폐기하므로 다음 연결부터 새 값이 적용됩니다.
+        이미 open()으로 연결된 클라이언트에는 close() 후 다시 열어야 반영됩니다.
+
+        Args:
+            max_turns: 최대 대화 턴 수
+        """
+        if max_turns != self.max_turns:
+            self.max_turns = max_turns
+            self._options = None
 
     async def _run_async(self, question: str) -> dict:
         """
@@ -85,53 +341,16 @@ class TextToSqlAgent:
                 "cost_usd": float | None,  # 비용 (USD)
             }
         """
-        options = self._create_options()
-        summary_parts = []
-        csv_path = None
-        cost_usd = None
-
-        # 새 질문 시작 전 쿼리 히스토리 초기화
-        try:
-            handler = get_handler()
-            handler.reset_query_history()
-        except RuntimeError:
-            pass
-
-        async with ClaudeSDKClient(options=options) as client:
-            await client.connect()
-            await client.query(question)
-
-            async for message in client.receive_response():
-                if isinstance(message, AssistantMessage):
-                    for block in message.content:
-                        if isinstance(block, TextBlock):
-                            summary_parts.append(block.text)
-
-                elif isinstance(message, ResultMessage):
-                    cost_usd = message.total_cost_usd
-
-        # 모든 실행된 쿼리 정보 가져오기
-        queries = []
-        try:
-            handler = get_handler()
-            # 모든 실행 쿼리 히스토리 사용
-            queries = handler._all_executed_queries.copy()
-
-            if hasattr(handler, '_last_csv_path') and handler._last_csv_path:
-                csv_path = handler._last_csv_path
-        except RuntimeError:
-            pass  # Handler not initialized
-
-        return {
-            "queries": queries,
-            "summary": "\n".join(summary_parts).strip(),
-            "csv_path": csv_path,
-            "cost_usd": cost_usd,
-        }
+        # 스트리밍 경로와 같은 로직을 사용하고 최종 결과만 반환
+        result = None
+        async for event in self.arun_streaming(question):
+            if event["type"] == "done":
+                result = event["result"]
+        return result
 
     def run(self, question: str) -> dict:
         """
-        동기 Agent 실행 (anyio.run 래퍼)
+        동기 Agent 실행 (영속 연결의 이벤트 루프에서 실행)
 
         Args:
             question: 사용자 질문
@@ -144,88 +363,132 @@ class TextToSqlAgent:
                 "cost_usd": float | None,
             }
         """
-        return anyio.run(self._run_async, question)
+        self.open()
+        return self._portal.call(self._run_async, question)
+
+    def _collect_result(self, summary_buf: io.StringIO, cost_usd: float | None) -> dict:
+        """실행 완료 후 결과 구조 생성 (실행 쿼리 히스토리/CSV 경로 수집)"""
+        queries = []
+        csv_path = None
+        handler = current_handler()
+        if handler is not None:
+            queries = handler.drain_queries()
+            csv_path = handler._last_csv_path or None
 
-    async def _run_streaming_async(self, question: str):
+        return {
+            "queries": queries,
+            "summary": summary_buf.getvalue().strip(),
+            "csv_path": csv_path,
+            "cost_usd": cost_usd,
+        }
+
+    async def arun_streaming(self, question: str, serialize: bool = False):
         """
-        스트리밍 Agent 실행 (진행 상황을 yield)
+        비동기 스트리밍 Agent 실행 (진행 상황을 yield)
+
+        이벤트 루프 안에서는 스레드 전환 없이 직접 소비할 수 있습니다.
+
+        사용법:
+            async with agent:
+                async for event in agent.arun_streaming(question):
+                    ...
 
         Args:
             question: 사용자 질문
+            serialize: True면 tool_call 입력을 JSON bytes("input_json")로 전달
+                       (이벤트를 그대로 웹 클라이언트 등에 보낼 때 사용)
 
         Yields:
             dict: 이벤트 정보
                 - {"type": "status", "message": str}  # 상태 메시지
                 - {"type": "tool_call", "name": str, "input": dict}  # Tool 호출
+                  (serialize=True면 "input" 대신 "input_json": bytes)
                 - {"type": "tool_result", "name": str, "result": str}  # Tool 결과
                 - {"type": "text", "content": str}  # 텍스트 응답
                 - {"type": "done", "result": dict}  # 완료
         """
-        options = self._create_options()
-        summary_parts = []
-        csv_path = None
+        summary_buf = io.StringIO()
         cost_usd = None
 
         # 새 질문 시작 전 쿼리 히스토리 초기화
-        try:
-            handler = get_handler()
+        handler = current_handler()
+        if handler is not None:
             handler.reset_query_history()
-        except RuntimeError:
-            pass
 
         yield {"type": "status", "message": "🔌 Agent 연결 중..."}
 
-        async with ClaudeSDKClient(options=options) as client:
-            await client.connect()
-
+        async with self._session(question) as client:
             yield {"type": "status", "message": "📤 질문 전송 중..."}
             await client.query(question)
 
             yield {"type": "status", "message": "🤔 분석 중..."}
 
-            async for message in client.receive_response():
-                if isinstance(message, AssistantMessage):
-                    for block in message.content:
-                        if isinstance(block, TextBlock):
-                            summary_parts.append(block.text)
-                            yield {"type": "text", "content": block.text}
-
-                        elif isinstance(block, ToolUseBlock):
-                            tool_name = block.name.split("__")[-1]  # mcp__text_to_sql__xxx -> xxx
-                            yield {
-                                "type": "tool_call",
-                                "name": tool_name,
-                                "input": block.input
-                            }
-
-                elif isinstance(message, ResultMessage):
-                    cost_usd = message.total_cost_usd
-
-        # 모든 실행된 쿼리 정보 가져오기
-        queries = []
-        try:
-            handler = get_handler()
-            queries = handler._all_executed_queries.copy()
-
-            if hasattr(handler, '_last_csv_path') and handler._last_csv_path:
-                csv_path = handler._last_csv_path
-        except RuntimeError:
-            pass
-
-        yield {
-            "type": "done",
-            "result": {
-                "queries": queries,
-                "summary": "\n".join(summary_parts).strip(),
-                "csv_path": csv_path,
-                "cost_usd": cost_usd,
-            }
-        }
+            # 연속 텍스트는 병합해서 전달 (tool_call 전 / 메시지 끝에서 반드시 비워 순서 유지)
+            coalescer = _TextCoalescer()
 
-    def run_streaming(self, question: str):
+            # 영속 연결에서 응답을 끝(ResultMessage)까지 읽지 못하고 중단되면
+            # 남은 메시지가 다음 질문의 응답으로 읽히므로 재연결 표시
+            finished = False
+            try:
+                async for message in client.receive_response():
+                    message_type = type(message)
+                    if message_type is AssistantMessage:
+                        for block in message.content:
+                            block_type = type(block)
+                            if block_type is TextBlock:
+                                content = coalescer.add(block.text)
+                                if content is not None:
+                                    yield {"type": "text", "content": content}
+                                summary_buf.write(block.text)
+                                summary_buf.write("\n")
+
+                            elif block_type is ToolUseBlock:
+                                content = coalescer.flush()
+                                if content is not None:
+                                    yield {"type": "text", "content": content}
+                                tool_name = (
+                                    _TOOL_SHORT_NAMES.get(block.name)
+                                    or block.name.rsplit("__", 1)[-1]
+                                )
+                                if serialize:
+                                    yield {
+                                        "type": "tool_call",
+                                        "name": tool_name,
+                                        "input_json": orjson.dumps(block.input),
+                                    }
+                                else:
+                                    yield {
+                                        "type": "tool_call",
+                                        "name": tool_name,
+                                        "input": block.input
+                                    }
+
+                        # 메시지 끝에서 남은 텍스트 방출 (다음 메시지까지 붙잡지 않음)
+                        content = coalescer.flush()
+                        if content is not None:
+                            yield {"type": "text", "content": content}
+
+                    elif message_type is ResultMessage:
+                        cost_usd = message.total_cost_usd
+
+                finished = True
+            finally:
+                if not finished and client is self._client:
+                    self._client_dirty = True
+
+            content = coalescer.flush()
+            if content is not None:
+                yield {"type": "text", "content": content}
+
+        yield {"type": "done", "result": self._collect_result(summary_buf, cost_usd)}
+
+    def run_streaming(self, question: str, serialize: bool = False):
         """
         동기 스트리밍 실행 (generator) - 실시간 이벤트 전달
 
+        arun_streaming()을 영속 연결의 이벤트 루프에서 실행하고
+        이벤트를 호출 스레드로 전달합니다. serialize는 arun_streaming()과 동일합니다.
+
         사용법:
             for event in agent.run_streaming(question):
                 if event["type"] == "tool_call":
@@ -233,45 +496,95 @@ class TextToSqlAgent:
                 elif event["type"] == "text":
                     print(event["content"])
         """
-        import threading
-        import queue
+        self.open()
 
-        event_queue = queue.Queue()
-        error_holder = [None]  # 에러 저장용
+        # 제한된 버퍼의 메모리 스트림 (소비가 느리면 생산자가 대기 → backpressure)
+        send_stream, receive_stream = anyio.create_memory_object_stream(STREAM_BUFFER_SIZE)
 
-        def run_async_in_thread():
-            """별도 스레드에서 비동기 코드 실행"""
-            try:
-                async def collect_and_queue():
-                    async for event in self._run_streaming_async(question):
-                        event_queue.put(event)
-                    event_queue.put(None)  # 종료 신호
-
-                anyio.run(collect_and_queue)
-            except Exception as e:
-                error_holder[0] = e
-                event_queue.put(None)
-
-        # 별도 스레드에서 비동기 실행
-        thread = threading.Thread(target=run_async_in_thread, daemon=True)
-        thread.start()
-
-        # 이벤트를 실시간으로 yield
-        while True:
-            try:
-                event = event_queue.get(timeout=120)  # 2분 타임아웃
-                if event is None:
-                    break
+        async def produce():
+            """영속 연결의 이벤트 루프에서 이벤트 생산"""
+            async with send_stream:
+                async for event in self.arun_streaming(question, serialize):
+                    await send_stream.send(event)
+
+        # 포털 이벤트 루프에서 실행 (연결 재사용)
+        future = self._portal.start_task_soon(produce)
+
+        try:
+            while True:
+                try:
+                    event = self._portal.call(_receive_event, receive_stream)
+                except anyio.EndOfStream:
+                    # 생산 완료 (에러로 종료되었다면 여기서 전파)
+                    future.result()
+                    return
+                except TimeoutError:
+                    if future.done():
+                        # 타임아웃 경계에서 생산이 끝난 경우: 남은 이벤트/종료 신호를 마저 수신
+                        continue
+                    yield {"type": "status", "message": "⏳ 대기 중... (타임아웃)"}
+                    return
                 yield event
-            except queue.Empty:
-                yield {"type": "status", "message": "⏳ 대기 중... (타임아웃)"}
-                break
+        finally:
+            # 타임아웃/소비 중단 시 생산자 취소
+            abandoned = not future.done()
+            if abandoned:
+                future.cancel()
+            receive_stream.close()
+            if abandoned:
+                # 응답을 끝까지 읽지 못한 연결은 버리고 다음 호출에서 새로 연결
+                # (남은 메시지/ResultMessage가 다음 질문의 응답으로 읽히지 않도록)
+                self.close()
+
+    def _cmd_help(self):
+        """/help: 명령어 도움말 출력"""
+        print("""
+사용 가능한 명령어:
+  /graph    - 스키마 그래프를 HTML로 시각화 (브라우저에서 열림)
+  /tables   - 테이블 목록 출력
+  /schema   - 전체 스키마 정보 출력
+  /help     - 이 도움말 출력
+  exit, quit, q - 종료
+""")
 
-        # 에러가 있었다면 raise
-        if error_holder[0]:
-            raise error_holder[0]
+    def _cmd_graph(self):
+        """/graph: 스키마 그래프 HTML 시각화"""
+        if self.context_method != "graph":
+            print("오류: /graph 명령은 graph 모드에서만 사용 가능합니다.")
+            print("  실행 시 -m graph 옵션을 사용하세요.")
+            return
+
+        try:
+            output_path = get_handler().context.visualize()
+            print(f"그래프 시각화 파일 생성: {output_path}")
+        except Exception as e:
+            print(f"오류: 그래프 시각화 실패 - {e}")
 
-        thread.join(timeout=5)
+    def _cmd_tables(self):
+        """/tables: 테이블 목록 출력"""
+        try:
+            tables = get_handler().list_tables()
+            print(f"\n테이블 목록 ({len(tables)}개):")
+            for t in tables:
+                print(f"  - {t['name']}: {t['description']}")
+            print()
+        except Exception as e:
+            print(f"오류: {e}")
+
+    def _cmd_schema(self):
+        """/schema: 전체 스키마 정보 출력"""
+        try:
+            print(get_handler().context.get_all_schema_context())
+        except Exception as e:
+            print(f"오류: {e}")
+
+    # 명령어 → 처리 메서드
+    _SLASH_COMMANDS = {
+        "/help": _cmd_help,
+        "/graph": _cmd_graph,
+        "/tables": _cmd_tables,
+        "/schema": _cmd_schema,
+    }
 
     def _handle_slash_command(self, command: str) -> bool:
         """
@@ -284,74 +597,23 @@ class TextToSqlAgent:
             True: 명령어 처리됨 (질문으로 전달하지 않음)
             False: 일반 질문으로 처리
         """
-        from .tools import get_handler
+        handler = self._SLASH_COMMANDS.get(command.lower().strip())
+        if handler is None:
+            return False  # 일반 질문으로 처리
 
-        cmd = command.lower().strip()
-
-        if cmd == "/help":
-            print("""
-사용 가능한 명령어:
-  /graph    - 스키마 그래프를 HTML로 시각화 (브라우저에서 열림)
-  /tables   - 테이블 목록 출력
-  /schema   - 전체 스키마 정보 출력
-  /help     - 이 도움말 출력
-  exit, quit, q - 종료
-""")
-            return True
-
-        if cmd == "/graph":
-            if self.context_method != "graph":
-                print("오류: /graph 명령은 graph 모드에서만 사용 가능합니다.")
-                print("  실행 시 -m graph 옵션을 사용하세요.")
-                return True
-
-            try:
-                handler = get_handler()
-                output_path = handler.context.visualize()
-                print(f"그래프 시각화 파일 생성: {output_path}")
-            except Exception as e:
-                print(f"오류: 그래프 시각화 실패 - {e}")
-            return True
-
-        if cmd == "/tables":
-            try:
-                handler = get_handler()
-                tables = handler.context.list_tables()
-                print(f"\n테이블 목록 ({len(tables)}개):")
-                for t in tables:
-                    print(f"  - {t['name']}: {t['description']}")
-                print()
-            except Exception as e:
-                print(f"오류: {e}")
-            return True
-
-        if cmd == "/schema":
-            try:
-                handler = get_handler()
-                schema_context = handler.context.get_all_schema_context()
-                print(schema_context)
-            except Exception as e:
-                print(f"오류: {e}")
-            return True
-
-        return False  # 일반 질문으로 처리
+        handler(self)
+        return True
 
     async def _run_interactive_async(self):
         """비동기 대화형 모드 실행"""
         print(f"Text to Sql Agent 시작 (모드: {self.context_method})")
         print("질문을 입력하세요. 명령어는 /help 를 입력하세요.\n")
 
-        options = self._create_options()
-
-        async with ClaudeSDKClient(options=options) as client:
-            await client.connect()
-
+        async with self._session() as client:
             while True:
                 try:
                     # 동기 input을 비동기 컨텍스트에서 사용
-                    question = await anyio.to_thread.run_sync(
-                        lambda: input("질문> ").strip()
-                    )
+                    question = await anyio.to_thread.run_sync(_read_question)
 
                     if not question:
                         continue
@@ -371,25 +633,25 @@ class TextToSqlAgent:
 
                     tool_count = 0
                     async for message in client.receive_response():
-                        if isinstance(message, AssistantMessage):
+                        message_type = type(message)
+                        if message_type is AssistantMessage:
                             for block in message.content:
-                                if isinstance(block, TextBlock):
+                                block_type = type(block)
+                                if block_type is TextBlock:
                                     print(f"\n답변:\n{block.text}")
-                                elif isinstance(block, ToolUseBlock):
+                                elif block_type is ToolUseBlock:
                                     tool_count += 1
 
                     # 실행된 쿼리 정보 출력
-                    try:
-                        handler = get_handler()
-                        if hasattr(handler, '_last_executed_sql') and handler._last_executed_sql:
+                    handler = current_handler()
+                    if handler is not None:
+                        if handler._last_executed_sql:
                             print(f"\n[실행된 쿼리]")
                             print(f"SQL: {handler._last_executed_sql}")
                             if handler._last_result:
                                 print(f"결과: {len(handler._last_result)}건")
-                        if hasattr(handler, '_last_csv_path') and handler._last_csv_path:
+                        if handler._last_csv_path:
                             print(f"CSV 저장: {handler._last_csv_path}")
-                    except RuntimeError:
-                        pass  # Handler not initialized
 
                     print(f"\n(Tool 호출 {tool_count}회)")
                     print("-" * 50)
@@ -401,5 +663,6 @@ class TextToSqlAgent:
                     print(f"\n오류 발생: {e}\n")
 
     def run_interactive(self):
-        """동기 대화형 모드 실행"""
-        anyio.run(self._run_interactive_async)
+        """동기 대화형 모드 실행 (run()과 같은 영속 연결 사용)"""
+        self.open()
+        self._portal.call(self._run_interactive_async)
@@ -1,10 +1,14 @@
 """시스템 프롬프트 모듈 - 모듈화된 프롬프트 관리"""
 
-from typing import Optional
-from dataclasses import dataclass, field
+import functools
+import sys
+from bisect import insort
+from operator import attrgetter
+from typing import Final, Optional
+from dataclasses import dataclass, field, replace
 
 
-@dataclass
+@dataclass(slots=True)
 class PromptSection:
     """프롬프트 섹션 정의"""
     name: str
@@ -13,6 +17,15 @@ class PromptSection:
     order: int = 0  # 낮을수록 먼저 출력
 
 
+_ORDER_KEY = attrgetter("order")
+
+# 마트/샤드 규칙이 필요한 질문으로 판단하는 키워드 (소문자)
+COST_QUERY_KEYWORDS = (
+    "aws", "비용", "cost", "마트", "mart", "샤드", "shard", "tag", "태그",
+    "servicegroup", "서비스그룹", "_pv",
+)
+
+
 class PromptBuilder:
     """
     모듈화된 시스템 프롬프트 빌더
@@ -28,6 +41,12 @@ class PromptBuilder:
         self._sections: dict[str, PromptSection] = {}
         self._order_counter = 0
 
+        # order 기준으로 항상 정렬된 전체 섹션 (add_section에서 삽입 위치 유지)
+        self._sorted: list[PromptSection] = []
+
+        # build() 캐시 (섹션 변경 시 무효화)
+        self._cached: Optional[str] = None
+
     def add_section(
         self,
         name: str,
@@ -51,36 +70,54 @@ class PromptBuilder:
             order = self._order_counter
             self._order_counter += 1
 
-        self._sections[name] = PromptSection(
+        name = sys.intern(name)  # 섹션 이름은 dict 키로 반복 조회되므로 intern
+
+        section = PromptSection(
             name=name,
             content=content,
             enabled=enabled,
             order=order
         )
+
+        old = self._sections.get(name)
+        if old is not None and old.order == order:
+            # 같은 위치의 섹션 교체
+            self._sorted[self._sorted.index(old)] = section
+        else:
+            if old is not None:
+                self._sorted.remove(old)
+            insort(self._sorted, section, key=_ORDER_KEY)
+
+        self._sections[name] = section
+        self._cached = None
         return self
 
     def enable_section(self, name: str) -> "PromptBuilder":
         """섹션 활성화"""
         if name in self._sections:
             self._sections[name].enabled = True
+            self._cached = None
         return self
 
     def disable_section(self, name: str) -> "PromptBuilder":
         """섹션 비활성화"""
         if name in self._sections:
             self._sections[name].enabled = False
+            self._cached = None
         return self
 
     def update_section(self, name: str, content: str) -> "PromptBuilder":
         """섹션 내용 업데이트"""
         if name in self._sections:
             self._sections[name].content = content
+            self._cached = None
         return self
 
     def append_to_section(self, name: str, content: str) -> "PromptBuilder":
         """기존 섹션에 내용 추가"""
         if name in self._sections:
             self._sections[name].content += "\n" + content
+            self._cached = None
         return self
 
     def get_section(self, name: str) -> Optional[str]:
@@ -89,42 +126,81 @@ class PromptBuilder:
             return self._sections[name].content
         return None
 
+    def copy(self) -> "PromptBuilder":
+        """
+        독립적으로 수정 가능한 복사본 생성
+
+        섹션 객체까지 복사하므로 복사본을 수정해도 원본에 영향이 없습니다.
+        (섹션 내용 문자열은 불변이므로 공유)
+
+        Returns:
+            새 PromptBuilder 인스턴스
+        """
+        clone = PromptBuilder.__new__(PromptBuilder)
+        clone._order_counter = self._order_counter
+        clone._sorted = [replace(s) for s in self._sorted]
+        clone._sections = {s.name: s for s in clone._sorted}
+        clone._cached = self._cached
+        return clone
+
+    def specialize_for_query(self, question: str) -> "PromptBuilder":
+        """
+        질문과 무관한 마트/샤드 규칙 섹션 비활성화
+
+        질문에 COST_QUERY_KEYWORDS가 하나도 없으면 mart_rules/shard_workflow를 끕니다.
+        시스템 프롬프트는 연결 단위로 고정되므로 질문마다 새로 연결하는 경우에만 의미가 있습니다.
+
+        Args:
+            question: 사용자 질문
+
+        Returns:
+            self (체이닝 지원)
+        """
+        question_lower = question.lower()
+        if not any(k in question_lower for k in COST_QUERY_KEYWORDS):
+            self.disable_section("mart_rules")
+            self.disable_section("shard_workflow")
+        return self
+
     def build(self) -> str:
         """
         활성화된 섹션들을 순서대로 조합하여 최종 프롬프트 생성
 
+        섹션이 바뀌지 않았으면 이전 결과를 그대로 반환합니다.
+        섹션 목록은 추가 시점에 정렬 상태로 유지되므로 정렬하지 않습니다.
+
         Returns:
             조합된 시스템 프롬프트 문자열
         """
-        enabled_sections = [
-            s for s in self._sections.values() if s.enabled
-        ]
-        sorted_sections = sorted(enabled_sections, key=lambda s: s.order)
+        if self._cached is not None:
+            return self._cached
 
-        return "\n\n".join(s.content for s in sorted_sections)
+        self._cached = "\n\n".join([s.content for s in self._sorted if s.enabled])
+        return self._cached
 
 
 # ============================================
 # 기본 프롬프트 섹션 정의
 # ============================================
 
-SECTION_ROLE = """당신은 Text to SQL Agent입니다.
+SECTION_ROLE: Final[str] = """당신은 Text to SQL Agent입니다.
 
 ## 역할
 - 사용자의 자연어 질문을 분석하여 적절한 SQL 쿼리를 생성합니다.
 - RDB에서 쿼리를 실행하고 결과를 반환합니다."""
 
 #1. **테이블 파악**: 먼저 `list_tables`로 사용 가능한 테이블을 확인합니다.
-SECTION_WORKFLOW = """## 작업 흐름
+SECTION_WORKFLOW: Final[str] = """## 작업 흐름
 1. **스키마 조회**: `get_schema_info`로 관련 테이블의 컬럼 정보를 확인합니다.
 2. **관계 확인**: 여러 테이블 조인이 필요하면 `get_join_hint`로 조인 조건을 확인합니다.
+   - 테이블이 2개 이상이면 `get_schema_bundle`로 스키마와 조인 조건을 한 번에 조회하세요.
 3. **SQL 생성**: 정보를 바탕으로 SQL 쿼리를 작성합니다.
 4. **검증**: `validate_sql`로 쿼리를 검증합니다. 실패 시 수정하여 재시도합니다.
 5. **실행**: 검증 통과 후 `execute_sql`로 실행합니다.
 6. **저장**: 필요시 `export_csv`로 결과를 CSV로 저장합니다."""
 
 
-SECTION_GRAPH_MODE_WORKFLOW = """## Graph 모드 특화 워크플로우
+SECTION_GRAPH_MODE_WORKFLOW: Final[str] = """## Graph 모드 특화 워크플로우
 
 Graph 모드에서는 NetworkX 그래프 기반으로 테이블 관계를 탐색합니다.
 
@@ -148,7 +224,7 @@ Graph 모드에서는 NetworkX 그래프 기반으로 테이블 관계를 탐색
 먼저 t_aws_mart_shard_l에서 table_loc를 조회한 후, 해당 테이블에서 데이터를 조회해야 합니다."""
 
 
-SECTION_RULES = """## 규칙
+SECTION_RULES: Final[str] = """## 규칙
 - SELECT 쿼리만 생성하세요. INSERT, UPDATE, DELETE는 금지입니다.
 - 반드시 validate_sql로 검증 후 execute_sql을 실행하세요.
 - 검증 실패 시 에러 메시지와 suggestion을 참고하여 수정하세요.
@@ -163,7 +239,7 @@ SECTION_RULES = """## 규칙
 - 하나의 질문에는 최소한의 쿼리만 실행하세요."""
 
 
-SECTION_RESPONSE_FORMAT = """## 응답 형식
+SECTION_RESPONSE_FORMAT: Final[str] = """## 응답 형식
 - 실행한 SQL 쿼리를 명시하세요.
 - 쿼리 결과의 주요 내용을 요약해서 설명하세요.
 - 데이터가 많으면 상위 몇 개만 보여주고 전체 건수를 알려주세요."""
@@ -173,7 +249,7 @@ SECTION_RESPONSE_FORMAT = """## 응답 형식
 # 비즈니스 로직 섹션 (마트 테이블 선택 규칙 등)
 # ============================================
 
-SECTION_MART_TABLE_SELECTION = """## 마트 테이블 선택 규칙
+SECTION_MART_TABLE_SELECTION: Final[str] = """## 마트 테이블 선택 규칙
 
 비용 데이터 조회 시 아래 규칙에 따라 적절한 마트 테이블을 선택하세요:
 
@@ -197,7 +273,7 @@ SECTION_MART_TABLE_SELECTION = """## 마트 테이블 선택 규칙
 - `svc_grp`: Service Group (서비스그룹 레벨)"""
 
 
-SECTION_SHARD_TABLE_WORKFLOW = """## 샤드 테이블 조회 워크플로우 (중요!)
+SECTION_SHARD_TABLE_WORKFLOW: Final[str] = """## 샤드 테이블 조회 워크플로우 (중요!)
 
 AWS 비용 마트 테이블들(`t_aws_use_cost_pv`, `t_aws_use_cost_l`, `t_aws_use_cost_rsrc_pv`, `t_aws_use_cost_svc_grp_pv`, `t_aws_use_cost_tag_pv`, `t_aws_tag_map_l`)은 **샤드 테이블**입니다.
 
@@ -261,37 +337,41 @@ def create_default_prompt_builder(
     """
     기본 설정의 PromptBuilder 생성
 
+    모드/설정과 무관한 정적 섹션을 앞에, 달라지는 섹션을 뒤에 배치하여
+    프롬프트 캐시가 적용되는 공통 prefix를 최대화합니다.
+
     Args:
         context_method: 컨텍스트 조회 방식 (yaml/graph)
         max_validation_retries: SQL 검증 최대 재시도 횟수
         include_mart_rules: 마트 테이블 선택 규칙 포함 여부
 
     Returns:
-        설정된 PromptBuilder 인스턴스
+        설정된 PromptBuilder 인스턴스 (호출마다 새 인스턴스, 자유롭게 수정 가능)
+    """
+    builder = _default_builder_template(context_method, include_mart_rules).copy()
+
+    # 검증 재시도 횟수 동적 추가
+    if max_validation_retries != 3:
+        builder.append_to_section(
+            "context_mode",
+            f"\n**참고**: SQL 검증 최대 재시도 횟수는 {max_validation_retries}회입니다."
+        )
+
+    return builder
+
+
+@functools.lru_cache(maxsize=8)
+def _default_builder_template(context_method: str, include_mart_rules: bool) -> PromptBuilder:
+    """
+    기본 PromptBuilder 원본 (설정 조합별로 1회 생성, 직접 수정 금지 - copy()해서 사용)
     """
     builder = PromptBuilder()
 
-    # 기본 섹션 추가
+    # ---- 정적 섹션 (모드/설정과 무관 → 프롬프트 캐시 prefix로 재사용) ----
     builder.add_section("role", SECTION_ROLE, order=0)
     builder.add_section("workflow", SECTION_WORKFLOW, order=10)
-
-    # Graph 모드 전용 워크플로우 (조인 경로 최적화)
-    builder.add_section(
-        "graph_workflow",
-        SECTION_GRAPH_MODE_WORKFLOW,
-        enabled=(context_method == "graph"),
-        order=15
-    )
-
     builder.add_section("rules", SECTION_RULES, order=20)
 
-    # 컨텍스트 모드 섹션
-    context_section = f"""## 컨텍스트 조회 방식
-현재 모드: **{context_method}**
-- yaml: YAML 메타데이터 문서에서 스키마 정보 조회
-- graph: NetworkX 그래프에서 테이블 관계 탐색 (조인 경로 추론 가능, `get_optimal_join_path` 사용)"""
-    builder.add_section("context_mode", context_section, order=30)
-
     # 마트 테이블 선택 규칙 (선택적)
     builder.add_section(
         "mart_rules",
@@ -311,16 +391,51 @@ def create_default_prompt_builder(
     # 응답 형식
     builder.add_section("response_format", SECTION_RESPONSE_FORMAT, order=50)
 
-    # 검증 재시도 횟수 동적 추가
-    if max_validation_retries != 3:
-        builder.append_to_section(
-            "workflow",
-            f"\n**참고**: SQL 검증 최대 재시도 횟수는 {max_validation_retries}회입니다."
-        )
+    # ---- 동적 섹션 (모드/설정별로 달라지므로 마지막에 배치) ----
+    # 컨텍스트 모드 섹션
+    context_section = f"""## 컨텍스트 조회 방식
+현재 모드: **{context_method}**
+- yaml: YAML 메타데이터 문서에서 스키마 정보 조회
+- graph: NetworkX 그래프에서 테이블 관계 탐색 (조인 경로 추론 가능, `get_optimal_join_path` 사용)"""
+    builder.add_section("context_mode", context_section, order=60)
+
+    # Graph 모드 전용 워크플로우 (조인 경로 최적화)
+    builder.add_section(
+        "graph_workflow",
+        SECTION_GRAPH_MODE_WORKFLOW,
+        enabled=(context_method == "graph"),
+        order=65
+    )
 
     return builder
 
 
+@functools.lru_cache(maxsize=16)
+def build_default_prompt(
+    context_method: str = "yaml",
+    max_validation_retries: int = 3,
+    include_mart_rules: bool = True,
+) -> str:
+    """
+    기본 시스템 프롬프트 문자열 반환 (설정 조합별로 프로세스당 1회 빌드)
+
+    빌더를 수정할 필요 없이 프롬프트만 필요한 경우 사용합니다.
+
+    Args:
+        context_method: 컨텍스트 조회 방식 (yaml/graph)
+        max_validation_retries: SQL 검증 최대 재시도 횟수
+        include_mart_rules: 마트 테이블 선택 규칙 포함 여부
+
+    Returns:
+        조합된 시스템 프롬프트 문자열
+    """
+    return create_default_prompt_builder(
+        context_method=context_method,
+        max_validation_retries=max_validation_retries,
+        include_mart_rules=include_mart_rules,
+    ).build()
+
+
 def create_minimal_prompt_builder(context_method: str = "yaml") -> PromptBuilder:
     """
     최소 구성의 PromptBuilder 생성 (테스트/디버깅용)
@@ -1,19 +1,90 @@
 """Claude Agent SDK Tool 정의 및 MCP 서버 생성"""
 
+import os
+from collections import deque
+from functools import lru_cache, partial
 from typing import Any, Optional
 
+import anyio
+import orjson
 from claude_agent_sdk import tool, create_sdk_mcp_server
 
-from ..context.metadata_rag import MetadataRAG
-from ..context.graph_rag import SchemaGraph
-from ..sql.validator import SQLValidator
-from ..sql.executor import ParallelExecutor
-from ..export.csv_exporter import CSVExporter
+from ..sql.result import ColumnarRows
+
+# 컨텍스트(networkx/yaml), DB 드라이버, pandas 모듈은 ToolHandler 생성 시점에 import합니다.
+# (MCP 서버/Tool 이름만 필요한 경우 로드하지 않음)
+
+
+# 질문 1회당 보관할 최대 실행 쿼리 수 (초과 시 오래된 것부터 제거)
+MAX_QUERY_HISTORY = 50
+
+# execute_sql 응답에 포함할 최대 행 수 (초과 시 미리보기만 반환)
+TOOL_PREVIEW_ROWS = 20
+
+# get_schema_bundle 1회 호출당 최대 테이블 수 (조인 힌트는 쌍마다 조회)
+SCHEMA_BUNDLE_MAX_TABLES = 10
+
+
+# 파싱된 컨텍스트 캐시: (context_method, metadata_path, mtime) -> MetadataRAG | SchemaGraph
+_context_cache: dict[tuple[str, str, float], Any] = {}
+
+
+def _load_context(context_method: str, metadata_path: str):
+    """
+    컨텍스트 시스템 생성 (같은 파일/모드는 재사용, 파일 수정 시 다시 로드)
+
+    Args:
+        context_method: "yaml" 또는 "graph"
+        metadata_path: 스키마 메타데이터 파일 경로
+
+    Returns:
+        MetadataRAG 또는 SchemaGraph 인스턴스
+    """
+    if context_method == "yaml":
+        from ..context.metadata_rag import MetadataRAG as context_cls
+    elif context_method == "graph":
+        from ..context.graph_rag import SchemaGraph as context_cls
+    else:
+        raise ValueError(f"지원하지 않는 context_method: {context_method}")
+
+    path = os.path.abspath(metadata_path)
+    if not os.path.exists(path):
+        return context_cls(metadata_path)  # 파일 없음 오류는 컨텍스트 클래스에서 발생
+
+    key = (context_method, path, os.path.getmtime(path))
+
+    context = _context_cache.get(key)
+    if context is None:
+        context = context_cls(metadata_path)
+        # 같은 파일의 이전 버전은 제거
+        for old_key in [k for k in _context_cache if k[:2] == key[:2]]:
+            del _context_cache[old_key]
+        _context_cache[key] = context
+    return context
 
 
 class ToolHandler:
     """Tool 실행 핸들러 - MCP 서버 도구들의 상태를 관리"""
 
+    __slots__ = (
+        "context_method",
+        "db_config",
+        "context",
+        "validator",
+        "executor",
+        "exporter",
+        "_last_result",
+        "_last_executed_sql",
+        "_last_csv_path",
+        "_all_executed_queries",
+        "_list_tables_cached",
+        "_search_cached",
+        "_json_cache",
+        "_exported",
+        "_graph_nodes",
+        "_join_fn",
+    )
+
     def __init__(
         self,
         context_method: str,
@@ -31,37 +102,82 @@ class ToolHandler:
         self.context_method = context_method
         self.db_config = db_config
 
-        # 컨텍스트 시스템 초기화
-        if context_method == "yaml":
-            self.context = MetadataRAG(metadata_path)
-        elif context_method == "graph":
-            self.context = SchemaGraph(metadata_path)
-        else:
-            raise ValueError(f"지원하지 않는 context_method: {context_method}")
+        # 컨텍스트 시스템 초기화 (파싱 결과는 모듈 캐시에서 재사용)
+        self.context = _load_context(context_method, metadata_path)
 
         # SQL 모듈 초기화
+        from ..sql.validator import SQLValidator
+        from ..sql.executor import ParallelExecutor
+        from ..export.csv_exporter import CSVExporter
+
         self.validator = SQLValidator(db_config)
         self.executor = ParallelExecutor(db_config)
         self.exporter = CSVExporter(output_dir)
 
         # 실행 결과 추적 (agent에서 결과 구조 생성 시 사용)
-        self._last_result: list = []
+        self._last_result: ColumnarRows | list = []
         self._last_executed_sql: str = ""
         self._last_csv_path: Optional[str] = None
+        self._exported: dict[str, dict] = {}  # 현재 _last_result의 export 결과 (filename -> 결과)
+
+        # 디버그용: 실행 쿼리 추적 (최근 MAX_QUERY_HISTORY개)
+        # [{"sql": str, "success": bool, "row_count": int, "data": ColumnarRows}]
+        self._all_executed_queries: deque = deque(maxlen=MAX_QUERY_HISTORY)
 
-        # 디버그용: 모든 실행 쿼리 추적
-        self._all_executed_queries: list = []  # [{"sql": str, "success": bool, "row_count": int, "data": list}]
+        # 스키마 조회 결과 캐시 (스키마는 프로세스 동안 고정)
+        self._list_tables_cached = lru_cache(maxsize=1)(self.context.list_tables)
+        self._search_cached = lru_cache(maxsize=128)(self.context.search_tables_by_keyword)
+
+        # 조인 힌트 조회 함수 (MetadataRAG: get_join_hint, SchemaGraph: find_join_path)
+        self._join_fn = (
+            self.context.get_join_hint if context_method == "yaml" else self.context.find_join_path
+        )
+
+        # Graph 모드 테이블(노드) 집합 (get_optimal_join_path의 누락 테이블 확인용)
+        self._graph_nodes: frozenset[str] = (
+            frozenset(self.context.graph) if context_method == "graph" else frozenset()
+        )
+
+        # 스키마 조회 Tool 응답 JSON 캐시: (tool 이름, 인자) -> JSON 문자열
+        self._json_cache: dict[tuple, str] = {}
+
+    def list_tables(self) -> list:
+        """테이블 목록 (캐시됨, 반환 리스트는 수정하지 마세요)"""
+        return self._list_tables_cached()
+
+    def search_tables(self, keyword: str) -> list:
+        """키워드 검색 결과 (키워드별 캐시됨, 반환 리스트는 수정하지 마세요)"""
+        return self._search_cached(keyword)
+
+    def reset_caches(self):
+        """스키마 조회 캐시 초기화 (메타데이터를 다시 로드한 경우 호출)"""
+        self._list_tables_cached.cache_clear()
+        self._search_cached.cache_clear()
+        self._json_cache.clear()
 
     def reset_query_history(self):
         """쿼리 히스토리 초기화 (새 질문 시작 시 호출)"""
-        self._all_executed_queries = []
+        self._all_executed_queries = deque(maxlen=MAX_QUERY_HISTORY)
         self._last_result = []
+        self._exported = {}
         self._last_executed_sql = ""
         self._last_csv_path = None
 
+    def drain_queries(self) -> list:
+        """
+        실행 쿼리 히스토리를 넘겨주고 비움 (행 데이터는 복사하지 않음)
+
+        Returns:
+            [{"sql": str, "success": bool, "row_count": int, "data": ColumnarRows, "error": str | None}, ...]
+        """
+        queries = self._all_executed_queries
+        self._all_executed_queries = deque(maxlen=MAX_QUERY_HISTORY)
+        return list(queries)
+
     def close(self):
         """리소스 정리"""
         self.validator.close()
+        self.executor.close()
 
 
 # 전역 핸들러 인스턴스
@@ -84,6 +200,12 @@ def init_handler(
     )
 
 
+def set_handler(handler: ToolHandler):
+    """이미 생성된 핸들러를 전역 핸들러로 등록 (캐시된 핸들러 재사용 시)"""
+    global _handler
+    _handler = handler
+
+
 def close_handler():
     """전역 핸들러 종료"""
     global _handler
@@ -99,24 +221,55 @@ def get_handler() -> ToolHandler:
     return _handler
 
 
+def current_handler() -> Optional[ToolHandler]:
+    """전역 핸들러 반환 (초기화 전이면 None, 예외 없음)"""
+    return _handler
+
+
 # =============================================================================
 # MCP Tool 정의 (@tool 데코레이터 사용)
 # =============================================================================
 
+def _json_default(obj: Any) -> str:
+    """orjson 기본 미지원 타입 변환 (Decimal 등 DB 값은 정밀도 유지를 위해 문자열로)"""
+    return str(obj)
+
+
+def _to_json(obj: Any) -> str:
+    """Tool 결과를 JSON 문자열로 변환"""
+    return orjson.dumps(obj, default=_json_default, option=orjson.OPT_NON_STR_KEYS).decode()
+
+
+def _text_response(obj: Any) -> dict[str, Any]:
+    """Tool 결과를 JSON 텍스트 응답으로 변환"""
+    return _json_text_response(_to_json(obj))
+
+
+def _json_text_response(text: str) -> dict[str, Any]:
+    """이미 직렬화된 JSON 문자열로 텍스트 응답 생성"""
+    return {"content": [{"type": "text", "text": text}]}
+
+
+def _error_response(message: str) -> dict[str, Any]:
+    """Tool 오류 응답 생성"""
+    return {"content": [{"type": "text", "text": message}], "is_error": True}
+
+
 @tool("list_tables", "사용 가능한 모든 테이블 목록을 조회합니다. 먼저 이 도구로 어떤 테이블이 있는지 확인하세요.", {})
 async def list_tables(args: dict[str, Any]) -> dict[str, Any]:
     """테이블 목록 조회"""
     handler = get_handler()
-    tables = handler.context.list_tables()
 
-    result = {
-        "tables": tables,
-        "count": len(tables),
-    }
+    text = handler._json_cache.get(("list_tables",))
+    if text is None:
+        tables = handler.list_tables()
+        result = {
+            "tables": tables,
+            "count": len(tables),
+        }
+        text = handler._json_cache[("list_tables",)] = _to_json(result)
 
-    return {
-        "content": [{"type": "text", "text": str(result)}]
-    }
+    return _json_text_response(text)
 
 
 @tool("get_schema_info", "특정 테이블의 스키마 정보(컬럼, 타입, 설명)와 다른 테이블과의 관계를 조회합니다.", {"table_name": str})
@@ -126,21 +279,18 @@ async def get_schema_info(args: dict[str, Any]) -> dict[str, Any]:
     table_name = args.get("table_name")
 
     if not table_name:
-        return {
-            "content": [{"type": "text", "text": "오류: table_name이 필요합니다."}],
-            "is_error": True
-        }
+        return _error_response("오류: table_name이 필요합니다.")
 
-    info = handler.context.get_table_info(table_name)
-    if info is None:
-        return {
-            "content": [{"type": "text", "text": f"오류: 테이블을 찾을 수 없습니다: {table_name}"}],
-            "is_error": True
-        }
+    # 같은 테이블 재조회가 잦으므로 직렬화 결과를 캐시 (존재하는 테이블만 저장)
+    key = ("get_schema_info", table_name)
+    text = handler._json_cache.get(key)
+    if text is None:
+        info = handler.context.get_table_info(table_name)
+        if info is None:
+            return _error_response(f"오류: 테이블을 찾을 수 없습니다: {table_name}")
+        text = handler._json_cache[key] = _to_json(info)
 
-    return {
-        "content": [{"type": "text", "text": str(info)}]
-    }
+    return _json_text_response(text)
 
 
 @tool("search_schema", "키워드로 관련 테이블과 컬럼을 검색합니다. 어떤 테이블을 사용해야 할지 모를 때 유용합니다.", {"keyword": str})
@@ -150,20 +300,15 @@ async def search_schema(args: dict[str, Any]) -> dict[str, Any]:
     keyword = args.get("keyword")
 
     if not keyword:
-        return {
-            "content": [{"type": "text", "text": "오류: keyword가 필요합니다."}],
-            "is_error": True
-        }
+        return _error_response("오류: keyword가 필요합니다.")
 
-    results = handler.context.search_tables_by_keyword(keyword)
+    results = handler.search_tables(keyword)
     result = {
         "results": results,
         "count": len(results),
     }
 
-    return {
-        "content": [{"type": "text", "text": str(result)}]
-    }
+    return _text_response(result)
 
 
 @tool("get_join_hint", "두 테이블 간의 조인 조건을 조회합니다.", {"table1": str, "table2": str})
@@ -174,32 +319,63 @@ async def get_join_hint(args: dict[str, Any]) -> dict[str, Any]:
     table2 = args.get("table2")
 
     if not table1 or not table2:
-        return {
-            "content": [{"type": "text", "text": "오류: table1과 table2가 필요합니다."}],
-            "is_error": True
-        }
-
-    # MetadataRAG의 경우
-    if hasattr(handler.context, "get_join_hint"):
-        hint = handler.context.get_join_hint(table1, table2)
-    # SchemaGraph의 경우
-    elif hasattr(handler.context, "find_join_path"):
-        hint = handler.context.find_join_path(table1, table2)
-    else:
-        return {
-            "content": [{"type": "text", "text": "오류: 조인 힌트를 조회할 수 없습니다."}],
-            "is_error": True
-        }
+        return _error_response("오류: table1과 table2가 필요합니다.")
 
+    hint = handler._join_fn(table1, table2)
     if hint is None:
-        return {
-            "content": [{"type": "text", "text": f"오류: {table1}과 {table2} 사이의 관계를 찾을 수 없습니다."}],
-            "is_error": True
-        }
+        return _error_response(f"오류: {table1}과 {table2} 사이의 관계를 찾을 수 없습니다.")
 
-    return {
-        "content": [{"type": "text", "text": str(hint)}]
-    }
+    return _text_response(hint)
+
+
+@tool(
+    "get_schema_bundle",
+    "여러 테이블의 스키마 정보와 테이블 쌍별 조인 조건을 한 번에 조회합니다. 사용할 테이블이 2개 이상이면 get_schema_info/get_join_hint를 반복 호출하는 대신 사용하세요.",
+    {"tables": list}
+)
+async def get_schema_bundle(args: dict[str, Any]) -> dict[str, Any]:
+    """
+    여러 테이블의 스키마 + 조인 힌트 일괄 조회
+
+    Args:
+        tables: 조회할 테이블 목록 (예: ["tbil_cmpn_l", "tbil_aws_ak_l"])
+
+    Returns:
+        {"tables": {테이블명: 스키마 정보}, "joins": [{"tables": [t1, t2], "hint": dict}], "missing": [테이블명]}
+    """
+    handler = get_handler()
+    tables = args.get("tables")
+
+    if not tables or not isinstance(tables, list):
+        return _error_response("오류: tables 목록이 필요합니다.")
+
+    if len(tables) > SCHEMA_BUNDLE_MAX_TABLES:
+        return _error_response(
+            f"오류: tables는 최대 {SCHEMA_BUNDLE_MAX_TABLES}개까지 조회할 수 있습니다."
+        )
+
+    infos = {}
+    missing = []
+    for table_name in dict.fromkeys(tables):  # 순서 유지 중복 제거
+        info = handler.context.get_table_info(table_name)
+        if info is None:
+            missing.append(table_name)
+        else:
+            infos[table_name] = info
+
+    joins = []
+    found = list(infos)
+    for i, table1 in enumerate(found):
+        for table2 in found[i + 1:]:
+            hint = handler._join_fn(table1, table2)
+            if hint is not None:
+                joins.append({"tables": [table1, table2], "hint": hint})
+
+    return _text_response({
+        "tables": infos,
+        "joins": joins,
+        "missing": missing,
+    })
 
 
 @tool("validate_sql", "SQL 쿼리의 문법과 테이블/컬럼 존재 여부를 검증합니다. 실행 전에 반드시 이 도구로 검증하세요.", {"sql": str})
@@ -209,12 +385,10 @@ async def validate_sql(args: dict[str, Any]) -> dict[str, Any]:
     sql = args.get("sql")
 
     if not sql:
-        return {
-            "content": [{"type": "text", "text": "오류: sql이 필요합니다."}],
-            "is_error": True
-        }
+        return _error_response("오류: sql이 필요합니다.")
 
-    result = handler.validator.validate(sql)
+    # EXPLAIN은 블로킹 I/O이므로 워커 스레드에서 실행 (이벤트 루프 차단 방지)
+    result = await anyio.to_thread.run_sync(handler.validator.validate, sql)
 
     # 에러 시 수정 제안 추가
     if not result["is_valid"] and result["errors"]:
@@ -224,9 +398,7 @@ async def validate_sql(args: dict[str, Any]) -> dict[str, Any]:
             error_type, error_msg
         )
 
-    return {
-        "content": [{"type": "text", "text": str(result)}]
-    }
+    return _text_response(result)
 
 
 @tool("execute_sql", "검증된 SQL 쿼리를 실행합니다. 대용량 데이터는 자동으로 병렬 처리됩니다.", {"sql": str, "parallel": bool})
@@ -236,44 +408,46 @@ async def execute_sql(args: dict[str, Any]) -> dict[str, Any]:
     sql = args.get("sql")
 
     if not sql:
-        return {
-            "content": [{"type": "text", "text": "오류: sql이 필요합니다."}],
-            "is_error": True
-        }
+        return _error_response("오류: sql이 필요합니다.")
 
     parallel = args.get("parallel", True)
 
-    result = handler.executor.execute(sql, parallel=parallel)
+    result = await anyio.to_thread.run_sync(
+        partial(handler.executor.execute, sql, parallel=parallel)
+    )
+
+    data = result.get("data") or []
+
+    # 결과는 열 단위로 보관 (행 dict는 접근 시 생성)
+    rows = ColumnarRows.from_records(data)
 
     # 모든 실행 쿼리를 히스토리에 추가 (디버그용)
     handler._all_executed_queries.append({
         "sql": sql,
         "success": result["success"],
         "row_count": result.get("row_count", 0),
-        "data": result.get("data", []),
+        "data": rows,
         "error": result.get("error") if not result["success"] else None,
     })
 
     # 성공 시 결과 저장
     if result["success"]:
-        handler._last_result = result["data"]
+        handler._last_result = rows
+        handler._exported = {}
         handler._last_executed_sql = sql
 
-    # 결과가 크면 요약
-    if result["success"] and len(result["data"]) > 20:
+    # 결과가 크면 요약 (작은 결과는 복사 없이 그대로 응답)
+    if result["success"] and len(data) > TOOL_PREVIEW_ROWS:
+        row_count = result["row_count"]
         summary = {
             "success": True,
-            "row_count": result["row_count"],
-            "preview": result["data"][:20],
-            "message": f"총 {result['row_count']}건 조회됨. 상위 20건만 표시."
-        }
-        return {
-            "content": [{"type": "text", "text": str(summary)}]
+            "row_count": row_count,
+            "preview": data[:TOOL_PREVIEW_ROWS],
+            "message": f"총 {row_count}건 조회됨. 상위 {TOOL_PREVIEW_ROWS}건만 표시."
         }
+        return _text_response(summary)
 
-    return {
-        "content": [{"type": "text", "text": str(result)}]
-    }
+    return _text_response(result)
 
 
 @tool("export_csv", "쿼리 결과를 CSV 파일로 저장합니다.", {"filename": str})
@@ -281,27 +455,32 @@ async def export_csv(args: dict[str, Any]) -> dict[str, Any]:
     """CSV 내보내기"""
     handler = get_handler()
 
-    if not handler._last_result:
-        return {
-            "content": [{"type": "text", "text": "오류: 내보낼 데이터가 없습니다. 먼저 execute_sql을 실행하세요."}],
-            "is_error": True
-        }
+    if len(handler._last_result) == 0:
+        return _error_response("오류: 내보낼 데이터가 없습니다. 먼저 execute_sql을 실행하세요.")
 
     filename = args.get("filename", "query_result")
 
-    result = handler.exporter.export(
-        data=handler._last_result,
-        filename=filename,
-        include_timestamp=True,
+    # 같은 결과를 같은 이름으로 다시 요청하면 기존 파일 재사용
+    previous = handler._exported.get(filename)
+    if previous is not None and os.path.exists(previous["file_path"]):
+        handler._last_csv_path = previous["file_path"]
+        return _text_response(previous)
+
+    result = await anyio.to_thread.run_sync(
+        partial(
+            handler.exporter.export,
+            data=handler._last_result,
+            filename=filename,
+            include_timestamp=True,
+        )
     )
 
     # CSV 경로 저장
     if result["success"]:
         handler._last_csv_path = result["file_path"]
+        handler._exported[filename] = result
 
-    return {
-        "content": [{"type": "text", "text": str(result)}]
-    }
+    return _text_response(result)
 
 
 @tool(
@@ -326,60 +505,35 @@ async def get_optimal_join_path(args: dict[str, Any]) -> dict[str, Any]:
 
     # Graph 모드 전용 체크
     if handler.context_method != "graph":
-        return {
-            "content": [{
-                "type": "text",
-                "text": "오류: get_optimal_join_path는 Graph 모드에서만 사용 가능합니다. YAML 모드에서는 get_join_hint를 테이블 쌍마다 호출하세요."
-            }],
-            "is_error": True
-        }
+        return _error_response(
+            "오류: get_optimal_join_path는 Graph 모드에서만 사용 가능합니다. YAML 모드에서는 get_join_hint를 테이블 쌍마다 호출하세요."
+        )
 
     tables = args.get("tables")
 
     if not tables:
-        return {
-            "content": [{"type": "text", "text": "오류: tables 목록이 필요합니다."}],
-            "is_error": True
-        }
+        return _error_response("오류: tables 목록이 필요합니다.")
 
     if not isinstance(tables, list) or len(tables) < 2:
-        return {
-            "content": [{"type": "text", "text": "오류: tables는 2개 이상의 테이블명 리스트여야 합니다."}],
-            "is_error": True
-        }
+        return _error_response("오류: tables는 2개 이상의 테이블명 리스트여야 합니다.")
 
     # SchemaGraph의 get_multi_hop_path 호출
     path_info = handler.context.get_multi_hop_path(tables)
 
     if path_info is None:
         # 어떤 테이블이 없는지 확인
-        missing = [t for t in tables if t not in handler.context.graph]
+        nodes = handler._graph_nodes
+        missing = [t for t in tables if t not in nodes]
         if missing:
-            return {
-                "content": [{
-                    "type": "text",
-                    "text": f"오류: 다음 테이블을 찾을 수 없습니다: {missing}"
-                }],
-                "is_error": True
-            }
-        return {
-            "content": [{
-                "type": "text",
-                "text": f"오류: {tables} 사이에 연결 경로가 없습니다. 관계가 정의되지 않았거나 연결되지 않은 테이블이 있습니다."
-            }],
-            "is_error": True
-        }
-
-    # SQL JOIN 절 예시 생성
-    join_clauses = []
-    base_table = path_info["path"][0]
-
-    for join in path_info["joins"]:
-        # from: table1.col → to: table2.col 형태의 condition
-        condition = join["condition"]
-        join_clauses.append(f"JOIN {join['to']} ON {condition}")
+            return _error_response(f"오류: 다음 테이블을 찾을 수 없습니다: {missing}")
+        return _error_response(
+            f"오류: {tables} 사이에 연결 경로가 없습니다. 관계가 정의되지 않았거나 연결되지 않은 테이블이 있습니다."
+        )
 
-    join_sql_example = f"FROM {base_table}\n" + "\n".join(join_clauses)
+    # SQL JOIN 절 예시 생성 (condition은 from: table1.col → to: table2.col 형태)
+    sql_lines = [f"FROM {path_info['path'][0]}"]
+    sql_lines.extend(f"JOIN {join['to']} ON {join['condition']}" for join in path_info["joins"])
+    join_sql_example = "\n".join(sql_lines)
 
     result = {
         "requested_tables": tables,
@@ -390,9 +544,7 @@ async def get_optimal_join_path(args: dict[str, Any]) -> dict[str, Any]:
         "note": "실제 쿼리 시 필요한 WHERE 조건(site_id, ym 등)을 추가하세요."
     }
 
-    return {
-        "content": [{"type": "text", "text": str(result)}]
-    }
+    return _text_response(result)
 
 
 # =============================================================================
@@ -409,6 +561,7 @@ def create_text_to_sql_mcp_server():
             get_schema_info,
             search_schema,
             get_join_hint,
+            get_schema_bundle,
             get_optimal_join_path,  # Graph 모드 전용
             validate_sql,
             execute_sql,
@@ -423,6 +576,7 @@ MCP_TOOL_NAMES = [
     "mcp__text_to_sql__get_schema_info",
     "mcp__text_to_sql__search_schema",
     "mcp__text_to_sql__get_join_hint",
+    "mcp__text_to_sql__get_schema_bundle",
     "mcp__text_to_sql__get_optimal_join_path",  # Graph 모드 전용
     "mcp__text_to_sql__validate_sql",
     "mcp__text_to_sql__execute_sql",
@@ -1,4 +1,22 @@
-from .metadata_rag import MetadataRAG
-from .graph_rag import SchemaGraph
+# 하위 모듈은 실제로 이름에 접근할 때 로드합니다 (PEP 562).
+# yaml 모드에서는 networkx를 import하지 않습니다.
+from importlib import import_module
 
-__all__ = ["MetadataRAG", "SchemaGraph"]
+_EXPORTS = {
+    "MetadataRAG": ".metadata_rag",
+    "SchemaGraph": ".graph_rag",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(_EXPORTS[name], __name__), name)
+    globals()[name] = value  # 이후 접근은 모듈 속성으로 바로 조회
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
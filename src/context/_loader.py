@@ -0,0 +1,75 @@
+"""스키마 메타데이터 YAML 로더 (MetadataRAG / SchemaGraph 공용)"""
+
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import yaml
+
+# libyaml C 파서 사용 (미설치 환경에서는 순수 Python 파서로 대체)
+try:
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:
+    from yaml import SafeLoader
+
+# 병렬 로드 최대 스레드 수
+MAX_LOAD_WORKERS = 8
+
+
+def load_metadata_file(metadata_path: Path) -> dict:
+    """
+    메타데이터 YAML 파일 1개 로드
+
+    Args:
+        metadata_path: YAML 파일 경로
+
+    Returns:
+        메타데이터 dict (빈 파일이면 {}). 테이블명 키는 sys.intern 처리됩니다.
+    """
+    metadata_path = Path(metadata_path)
+    if not metadata_path.exists():
+        raise FileNotFoundError(f"메타데이터 파일을 찾을 수 없습니다: {metadata_path}")
+
+    with open(metadata_path, "r", encoding="utf-8") as f:
+        metadata = yaml.load(f, Loader=SafeLoader) or {}
+
+    # 테이블명은 그래프 노드/관계/캐시 키로 반복 사용되므로 하나의 문자열 객체로 공유
+    tables = metadata.get("tables")
+    if tables:
+        metadata["tables"] = {sys.intern(name): info for name, info in tables.items()}
+    return metadata
+
+
+def load_metadata_files(paths: list) -> dict:
+    """
+    여러 메타데이터 YAML 파일을 스레드 풀로 동시에 로드해 하나로 병합
+
+    - tables / business_glossary: dict 병합 (같은 키는 뒤 파일 우선)
+    - relationships: 파일 순서대로 이어 붙임
+    - 그 외 최상위 키: 뒤 파일 우선
+
+    Args:
+        paths: YAML 파일 경로 목록 (테이블별로 분할된 메타데이터 등)
+
+    Returns:
+        병합된 메타데이터 dict
+    """
+    if not paths:
+        raise ValueError("메타데이터 파일 경로가 비어 있습니다.")
+
+    if len(paths) == 1:
+        documents = [load_metadata_file(paths[0])]
+    else:
+        with ThreadPoolExecutor(max_workers=min(len(paths), MAX_LOAD_WORKERS)) as pool:
+            documents = list(pool.map(load_metadata_file, paths))  # 입력 순서 유지
+
+    merged = {"tables": {}, "relationships": [], "business_glossary": {}}
+    for doc in documents:
+        for key, value in doc.items():
+            if key in ("tables", "business_glossary"):
+                merged[key].update(value or {})
+            elif key == "relationships":
+                merged[key].extend(value or [])
+            else:
+                merged[key] = value
+    return merged
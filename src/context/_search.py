@@ -0,0 +1,63 @@
+"""스키마 키워드 검색 인덱스 (MetadataRAG / SchemaGraph 공용)"""
+
+from bisect import bisect_right
+
+# 필드 / 테이블 구분자 (검색 키워드에 포함될 일이 없는 제어 문자)
+FIELD_SEP = "\0"
+TABLE_SEP = "\x01"
+
+
+class SubstringIndex:
+    """
+    테이블별 검색 문자열을 하나로 합쳐 두고 부분 문자열 검색
+
+    테이블마다 `keyword in haystack`을 반복하는 대신
+    합친 문자열 전체를 str.find로 한 번 훑고, 매칭 위치로 테이블을 찾습니다.
+    한 테이블에서 매칭되면 다음 테이블 시작 위치로 건너뜁니다.
+    """
+
+    __slots__ = ("_names", "_starts", "_text")
+
+    def __init__(self, entries: list[tuple[str, list[str]]]):
+        """
+        Args:
+            entries: [(테이블명, [검색 대상 필드, ...]), ...]
+        """
+        self._names = [name for name, _ in entries]
+        self._starts = []
+
+        haystacks = []
+        offset = 0
+        for _, fields in entries:
+            haystack = FIELD_SEP.join(fields).lower()
+            self._starts.append(offset)
+            haystacks.append(haystack)
+            offset += len(haystack) + len(TABLE_SEP)
+        self._text = TABLE_SEP.join(haystacks)
+
+    def search(self, keyword_lower: str) -> list[str]:
+        """
+        키워드(소문자)를 포함하는 테이블명 목록 (인덱스 생성 순서 유지)
+
+        Args:
+            keyword_lower: 소문자로 변환된 검색 키워드
+
+        Returns:
+            매칭된 테이블명 리스트
+        """
+        if not self._names or FIELD_SEP in keyword_lower or TABLE_SEP in keyword_lower:
+            return []
+
+        names = self._names
+        starts = self._starts
+        last = len(names) - 1
+
+        matched = []
+        pos = self._text.find(keyword_lower)
+        while pos != -1:
+            i = bisect_right(starts, pos) - 1
+            matched.append(names[i])
+            if i == last:
+                break
+            pos = self._text.find(keyword_lower, starts[i + 1])
+        return matched
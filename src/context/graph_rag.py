@@ -1,9 +1,14 @@
 """NetworkX 기반 스키마 그래프 모듈"""
 
-import yaml
+import sys
+from collections import deque
+from functools import lru_cache
 from pathlib import Path
 from typing import Optional
 
+from ._loader import load_metadata_file, load_metadata_files
+from ._search import SubstringIndex
+
 import networkx as nx
 
 
@@ -21,39 +26,74 @@ class SchemaGraph:
     - 연결된 테이블 탐색 (neighbors)
     """
 
-    def __init__(self, metadata_path: str):
+    def __init__(self, metadata_path: str, metadata: Optional[dict] = None):
         """
         스키마 메타데이터를 로드하여 그래프 구축
 
         Args:
             metadata_path: schema_metadata.yaml 파일 경로
+            metadata: 이미 로드된 메타데이터 (from_paths 사용 시). None이면 파일에서 로드
         """
         self.metadata_path = Path(metadata_path)
-        self.metadata = self._load_metadata()
+        self.metadata = metadata if metadata is not None else self._load_metadata()
         self.graph = self._build_graph()
+        self._search_index = self._build_search_index()
+
+        # 경로 탐색용 인접 리스트 (NetworkX 중첩 dict 대신 노드 -> 이웃 튜플)
+        self._adjacency: dict[str, tuple[str, ...]] = {
+            node: tuple(self.graph.neighbors(node)) for node in self.graph.nodes
+        }
+
+        # 전체 쌍 최단 경로용 BFS 트리: 출발 테이블 -> {도달 노드: 이전 노드}
+        # (그래프는 구축 후 변경되지 않으므로 1회 계산, 노드 수백 개 규모에서 수 ms)
+        self._bfs_parents: dict[str, dict[str, Optional[str]]] = {
+            node: self._bfs_tree(node) for node in self._adjacency
+        }
+
+        # find_join_path 결과 캐시: (시작, 목표) -> 경로 정보 또는 None
+        self._join_path_cache: dict[tuple[str, str], Optional[dict]] = {}
+
+        # 테이블 정보 캐시 (그래프는 구축 후 변경되지 않으므로 미리 생성)
+        self._table_info: dict[str, dict] = {
+            node: self._build_table_info(node) for node in self.graph.nodes
+        }
+
+        # get_all_schema_context 결과 캐시 (첫 호출 시 생성)
+        self._context_cache: Optional[str] = None
+
+    @classmethod
+    def from_paths(cls, paths: list) -> "SchemaGraph":
+        """
+        여러 메타데이터 YAML 파일(테이블별 분할 등)을 병렬로 로드해 생성
+
+        Args:
+            paths: YAML 파일 경로 목록 (metadata_path는 첫 번째 경로)
+
+        Returns:
+            SchemaGraph 인스턴스
+        """
+        return cls(paths[0], metadata=load_metadata_files(paths))
 
     def _load_metadata(self) -> dict:
         """YAML 파일 로드"""
-        if not self.metadata_path.exists():
-            raise FileNotFoundError(f"메타데이터 파일을 찾을 수 없습니다: {self.metadata_path}")
-
-        with open(self.metadata_path, "r", encoding="utf-8") as f:
-            return yaml.safe_load(f)
+        return load_metadata_file(self.metadata_path)
 
-    def _build_graph(self) -> nx.DiGraph:
+    def _build_graph(self) -> nx.Graph:
         """
         메타데이터로부터 NetworkX 그래프 구축
 
         - 노드: 테이블 (속성: description, columns, source)
-        - 엣지: FK 관계 (속성: from_col, to_col, type, description)
+        - 엣지: FK 관계, 무방향 1개 (속성: from_table, from_col, to_col, type, description,
+          join_condition, reverse_join_condition)
+          조인 조건의 방향은 조회 시 _join_condition()으로 맞춥니다.
         """
-        G = nx.DiGraph()
+        G = nx.Graph()
 
         # 테이블을 노드로 추가
         tables = self.metadata.get("tables", {})
         for table_name, table_info in tables.items():
             G.add_node(
-                table_name,
+                sys.intern(table_name),
                 description=table_info.get("description", ""),
                 source=table_info.get("source", ""),
                 columns=table_info.get("columns", []),
@@ -65,56 +105,76 @@ class SchemaGraph:
             from_parts = rel["from"].split(".")
             to_parts = rel["to"].split(".")
 
-            from_table = from_parts[0]
+            from_table = sys.intern(from_parts[0])
             from_col = from_parts[1] if len(from_parts) > 1 else ""
-            to_table = to_parts[0]
+            to_table = sys.intern(to_parts[0])
             to_col = to_parts[1] if len(to_parts) > 1 else ""
 
-            # 양방향 엣지 추가 (조인은 양방향 가능)
-            edge_attrs = {
-                "from_col": from_col,
-                "to_col": to_col,
-                "type": rel.get("type", ""),
-                "description": rel.get("description", ""),
-                "join_condition": f"{rel['from']} = {rel['to']}",
-            }
-
-            G.add_edge(from_table, to_table, **edge_attrs)
-            # 역방향 엣지 (컬럼명 스왑)
+            # 무방향 엣지 1개 (조인은 양방향 가능, 원래 방향은 from_table로 기록)
             G.add_edge(
-                to_table,
                 from_table,
-                from_col=to_col,
-                to_col=from_col,
+                to_table,
+                from_table=from_table,
+                from_col=from_col,
+                to_col=to_col,
                 type=rel.get("type", ""),
                 description=rel.get("description", ""),
-                join_condition=f"{rel['to']} = {rel['from']}",
+                join_condition=f"{rel['from']} = {rel['to']}",
+                reverse_join_condition=f"{rel['to']} = {rel['from']}",
             )
 
         return G
 
+    @staticmethod
+    def _join_condition(edge_data: dict, from_table: str) -> str:
+        """from_table 쪽에서 본 조인 조건 (엣지에 기록된 방향과 반대면 좌우를 바꾼 조건)"""
+        if edge_data.get("from_table") == from_table:
+            return edge_data.get("join_condition", "")
+        return edge_data.get("reverse_join_condition", "")
+
+    def _build_search_index(self) -> SubstringIndex:
+        """
+        키워드 검색용 인덱스 생성 (그래프 구축 후 1회)
+
+        노드별로 테이블명/설명/컬럼명/컬럼 설명을 소문자로 변환해 하나의 문자열로 합쳐 둡니다.
+        필드/테이블 사이는 제어 문자로 구분하므로 경계를 넘는 오매칭이 없습니다.
+
+        Returns:
+            SubstringIndex
+        """
+        entries = []
+        for node, node_data in self.graph.nodes(data=True):
+            fields = [node, node_data.get("description", "")]
+            for col in node_data.get("columns", []):
+                fields.append(col["name"])
+                fields.append(col.get("description", ""))
+            entries.append((node, fields))
+        return SubstringIndex(entries)
+
     def get_table_info(self, table_name: str) -> Optional[dict]:
         """
         테이블 정보 + 연결된 테이블 정보 반환
 
+        미리 생성해 둔 dict를 그대로 반환하므로 호출 측에서 수정하지 마세요.
+
         Args:
             table_name: 조회할 테이블명
 
         Returns:
             테이블 정보 dict 또는 None
         """
-        if table_name not in self.graph:
-            return None
+        return self._table_info.get(table_name)
 
+    def _build_table_info(self, table_name: str) -> dict:
+        """테이블 정보 dict 생성 (get_table_info 캐시용)"""
         node_data = self.graph.nodes[table_name]
 
         # 연결된 테이블 정보
         connected_tables = []
-        for neighbor in self.graph.neighbors(table_name):
-            edge_data = self.graph.edges[table_name, neighbor]
+        for neighbor, edge_data in self.graph.adj[table_name].items():
             connected_tables.append({
                 "table": neighbor,
-                "join_condition": edge_data.get("join_condition", ""),
+                "join_condition": self._join_condition(edge_data, table_name),
                 "relationship": edge_data.get("type", ""),
             })
 
@@ -130,6 +190,9 @@ class SchemaGraph:
         """
         두 테이블 간 최단 조인 경로 찾기
 
+        그래프는 변경되지 않으므로 테이블 쌍별 결과를 캐시합니다.
+        반환 dict는 공유되므로 호출 측에서 수정하지 마세요.
+
         Args:
             from_table: 시작 테이블
             to_table: 목표 테이블
@@ -140,20 +203,28 @@ class SchemaGraph:
         if from_table not in self.graph or to_table not in self.graph:
             return None
 
-        try:
-            # 최단 경로 탐색
-            path = nx.shortest_path(self.graph, from_table, to_table)
-        except nx.NetworkXNoPath:
+        key = (from_table, to_table)
+        if key not in self._join_path_cache:
+            self._join_path_cache[key] = self._build_join_path(from_table, to_table)
+        return self._join_path_cache[key]
+
+    def _build_join_path(self, from_table: str, to_table: str) -> Optional[dict]:
+        """find_join_path 결과 생성 (캐시 미스 시)"""
+        # 최단 경로 (미리 계산한 BFS 트리에서 역추적)
+        if to_table not in self._bfs_parents[from_table]:
             return None
+        path = self._tree_path(from_table, to_table)
 
-        # 경로 상의 조인 조건 추출
+        # 경로 상의 조인 조건 추출 (adj[u][v]: 엣지 속성 dict를 한 번에 조회)
+        adj = self.graph.adj
         joins = []
-        for i in range(len(path) - 1):
-            edge_data = self.graph.edges[path[i], path[i + 1]]
-            joins.append({
-                "from": path[i],
-                "to": path[i + 1],
-                "condition": edge_data.get("join_condition", ""),
+        append = joins.append
+        for u, v in zip(path, path[1:]):
+            edge_data = adj[u][v]
+            append({
+                "from": u,
+                "to": v,
+                "condition": self._join_condition(edge_data, u),
                 "type": edge_data.get("type", ""),
             })
 
@@ -183,33 +254,29 @@ class SchemaGraph:
         """
         전체 스키마를 컨텍스트 문자열로 반환
 
+        그래프는 구축 후 변경되지 않으므로 첫 호출 시 1회 생성 후 캐시합니다.
+
         Returns:
             LLM에 전달할 스키마 정보 문자열
         """
-        lines = ["# 데이터베이스 스키마 정보 (Graph 기반)\n"]
-
-        # 테이블 정보
-        for node in self.graph.nodes:
-            node_data = self.graph.nodes[node]
-            lines.append(f"## 테이블: {node}")
-            lines.append(f"설명: {node_data.get('description', '')}")
-            lines.append(f"소스: {node_data.get('source', '')}")
-            lines.append("컬럼:")
-
-            for col in node_data.get("columns", []):
-                lines.append(f"  - {col['name']} ({col['type']}): {col.get('description', '')}")
+        if self._context_cache is None:
+            self._context_cache = self._build_schema_context()
+        return self._context_cache
 
-            # 연결된 테이블
-            neighbors = list(self.graph.neighbors(node))
-            if neighbors:
-                lines.append(f"연결된 테이블: {', '.join(neighbors)}")
+    def _build_schema_context(self) -> str:
+        """get_all_schema_context 문자열 생성 (캐시 미스 시)"""
+        lines = ["# 데이터베이스 스키마 정보 (Graph 기반)\n"]
 
-            lines.append("")
+        # 테이블 정보 (노드별 블록을 한 번에 포맷)
+        lines.extend(
+            self._format_table_block(node, node_data)
+            for node, node_data in self.graph.nodes(data=True)
+        )
 
         # 그래프 통계
         lines.append("## 그래프 통계")
         lines.append(f"  - 테이블 수: {self.graph.number_of_nodes()}")
-        lines.append(f"  - 관계 수: {self.graph.number_of_edges() // 2}")  # 양방향이므로 /2
+        lines.append(f"  - 관계 수: {self.graph.number_of_edges()}")
 
         # 비즈니스 용어
         glossary = self.metadata.get("business_glossary", {})
@@ -220,6 +287,25 @@ class SchemaGraph:
 
         return "\n".join(lines)
 
+    def _format_table_block(self, node: str, node_data: dict) -> str:
+        """테이블 노드 1개의 컨텍스트 블록 (헤더 + 컬럼 목록 + 연결된 테이블 + 빈 줄)"""
+        header = (
+            f"## 테이블: {node}\n"
+            f"설명: {node_data.get('description', '')}\n"
+            f"소스: {node_data.get('source', '')}\n"
+            "컬럼:"
+        )
+        columns = "".join(
+            f"\n  - {col['name']} ({col['type']}): {col.get('description', '')}"
+            for col in node_data.get("columns", [])
+        )
+
+        # 연결된 테이블
+        neighbors = self._adjacency[node]
+        connected = f"\n연결된 테이블: {', '.join(neighbors)}" if neighbors else ""
+
+        return f"{header}{columns}{connected}\n"
+
     def search_tables_by_keyword(self, keyword: str) -> list:
         """
         키워드로 관련 테이블 검색
@@ -231,30 +317,12 @@ class SchemaGraph:
             관련 테이블 정보 리스트
         """
         keyword_lower = keyword.lower()
-        results = []
 
-        for node in self.graph.nodes:
-            node_data = self.graph.nodes[node]
-            matched = False
-
-            # 테이블명 검색
-            if keyword_lower in node.lower():
-                matched = True
-            # 설명 검색
-            elif keyword_lower in node_data.get("description", "").lower():
-                matched = True
-            # 컬럼명/설명 검색
-            else:
-                for col in node_data.get("columns", []):
-                    if keyword_lower in col["name"].lower():
-                        matched = True
-                        break
-                    if keyword_lower in col.get("description", "").lower():
-                        matched = True
-                        break
-
-            if matched:
-                results.append(self.get_table_info(node))
+        # 테이블명, 설명, 컬럼명/설명에서 검색 (미리 합쳐 둔 검색 문자열 사용)
+        results = [
+            self.get_table_info(node)
+            for node in self._search_index.search(keyword_lower)
+        ]
 
         # 비즈니스 용어 매핑도 검색
         glossary = self.metadata.get("business_glossary", {})
@@ -289,55 +357,45 @@ class SchemaGraph:
             if table not in self.graph:
                 return None
 
-        # 간단한 접근: 첫 번째 테이블에서 시작해서 순차적으로 연결
-        # (최적은 아니지만 실용적)
+        # 메트릭 클로저 기반 Steiner Tree 2-근사 (Kou-Markowsky-Berman)
+        # 1) 테이블 쌍별 최단 거리로 완전 그래프 구성 (미리 계산한 BFS 트리 사용)
+        terminals = list(dict.fromkeys(tables))
+        closure = nx.Graph()
+        closure.add_nodes_from(terminals)
+        for i, t1 in enumerate(terminals):
+            parents = self._bfs_parents[t1]
+            for t2 in terminals[i + 1:]:
+                if t2 not in parents:
+                    # 연결 불가능한 테이블 존재
+                    return None
+                closure.add_edge(t1, t2, weight=len(self._tree_path(t1, t2)) - 1)
+
+        # 2) 완전 그래프의 최소 신장 트리
+        mst = nx.minimum_spanning_tree(closure)
+
+        # 3) MST 엣지를 실제 스키마 경로로 펼치기 (첫 번째 테이블부터 DFS 순서)
+        #    이미 방문한 테이블로 들어가는 엣지는 건너뛰어 결과가 트리가 되도록 합니다.
+        adj = self.graph.adj
         all_joins = []
-        visited_tables = set()
-        ordered_path = [tables[0]]
-        visited_tables.add(tables[0])
-
-        remaining = set(tables[1:])
-
-        while remaining:
-            best_next = None
-            best_path = None
-            best_length = float("inf")
-
-            # 현재까지 방문한 테이블에서 남은 테이블로 가는 최단 경로 찾기
-            for visited in visited_tables:
-                for target in remaining:
-                    try:
-                        path = nx.shortest_path(self.graph, visited, target)
-                        if len(path) < best_length:
-                            best_length = len(path)
-                            best_next = target
-                            best_path = path
-                    except nx.NetworkXNoPath:
-                        continue
-
-            if best_next is None:
-                # 연결 불가능한 테이블 존재
-                return None
-
-            # 경로 상의 조인 조건 추출
-            for i in range(len(best_path) - 1):
-                from_t, to_t = best_path[i], best_path[i + 1]
-                if (from_t, to_t) not in [(j["from"], j["to"]) for j in all_joins]:
-                    edge_data = self.graph.edges[from_t, to_t]
-                    all_joins.append({
-                        "from": from_t,
-                        "to": to_t,
-                        "condition": edge_data.get("join_condition", ""),
-                        "type": edge_data.get("type", ""),
-                    })
-
-            # 경로 상의 모든 테이블을 visited에 추가
-            for t in best_path:
-                visited_tables.add(t)
-                if t not in ordered_path:
-                    ordered_path.append(t)
-
-            remaining.remove(best_next)
+        append_join = all_joins.append
+        visited_tables = {terminals[0]}
+        ordered_path = [terminals[0]]
+
+        for t1, t2 in nx.dfs_edges(mst, source=terminals[0]):
+            path = self._tree_path(t1, t2)
+            for from_t, to_t in zip(path, path[1:]):
+                if to_t in visited_tables:
+                    continue
+                visited_tables.add(to_t)
+                ordered_path.append(to_t)
+
+                edge_data = adj[from_t][to_t]
+                append_join({
+                    "from": from_t,
+                    "to": to_t,
+                    "condition": self._join_condition(edge_data, from_t),
+                    "type": edge_data.get("type", ""),
+                })
 
         return {
             "tables": tables,
@@ -346,6 +404,37 @@ class SchemaGraph:
             "total_hops": len(all_joins),
         }
 
+    def _tree_path(self, from_table: str, to_table: str) -> list:
+        """
+        BFS 트리에서 최단 경로 역추적 (to_table이 도달 가능한 경우에만 호출)
+
+        Returns:
+            [from_table, ..., to_table]
+        """
+        parents = self._bfs_parents[from_table]
+        path = [to_table]
+        node = to_table
+        while parents[node] is not None:
+            node = parents[node]
+            path.append(node)
+        path.reverse()
+        return path
+
+    def _bfs_tree(self, source: str) -> dict[str, Optional[str]]:
+        """출발 테이블 기준 BFS 트리 (도달 가능한 노드 -> 이전 노드, 출발점은 None)"""
+        adjacency = self._adjacency
+        parents: dict[str, Optional[str]] = {source: None}
+        queue = deque([source])
+
+        while queue:
+            node = queue.popleft()
+            for neighbor in adjacency[node]:
+                if neighbor not in parents:
+                    parents[neighbor] = node
+                    queue.append(neighbor)
+
+        return parents
+
     def get_join_hint(self, table1: str, table2: str) -> Optional[dict]:
         """
         두 테이블 간의 조인 힌트 반환 (MetadataRAG와 호환용)
@@ -382,7 +471,10 @@ class SchemaGraph:
 
     def visualize(self, output_path: str = "./output/schema_graph.html", open_browser: bool = True) -> str:
         """
-        Pyvis를 사용하여 그래프를 HTML로 시각화
+        vis.js 기반 HTML로 그래프 시각화
+
+        노드/엣지를 orjson으로 직렬화해 Jinja 템플릿(templates/schema_graph.html.jinja)에 바로 기록합니다.
+        vis.js는 CDN에서 로드하므로 JS 라이브러리를 복사하지 않습니다.
 
         Args:
             output_path: 출력할 HTML 파일 경로
@@ -391,58 +483,17 @@ class SchemaGraph:
         Returns:
             생성된 HTML 파일 경로
         """
-        from pyvis.network import Network
         import webbrowser
-        from pathlib import Path
+
+        import orjson
 
         # 출력 디렉토리 생성
         output_file = Path(output_path)
         output_file.parent.mkdir(parents=True, exist_ok=True)
 
-        # Pyvis 네트워크 생성
-        net = Network(
-            height="750px",
-            width="100%",
-            bgcolor="#ffffff",
-            font_color="#333333",
-            directed=True,
-            notebook=False,
-        )
-
-        # 물리 엔진 설정 (노드 배치)
-        net.set_options("""
-        {
-            "nodes": {
-                "shape": "box",
-                "font": {"size": 14, "face": "arial"},
-                "borderWidth": 2,
-                "shadow": true
-            },
-            "edges": {
-                "arrows": {"to": {"enabled": true, "scaleFactor": 0.5}},
-                "color": {"color": "#848484", "highlight": "#1E90FF"},
-                "font": {"size": 10, "align": "middle"},
-                "smooth": {"type": "curvedCW", "roundness": 0.2}
-            },
-            "physics": {
-                "enabled": true,
-                "barnesHut": {
-                    "gravitationalConstant": -3000,
-                    "centralGravity": 0.3,
-                    "springLength": 200,
-                    "springConstant": 0.04
-                }
-            },
-            "interaction": {
-                "hover": true,
-                "tooltipDelay": 100
-            }
-        }
-        """)
-
-        # 노드 추가 (테이블)
-        for node in self.graph.nodes:
-            node_data = self.graph.nodes[node]
+        # 노드 (테이블)
+        nodes = []
+        for node, node_data in self.graph.nodes(data=True):
             columns = node_data.get("columns", [])
 
             # 툴팁에 컬럼 정보 표시
@@ -455,42 +506,54 @@ class SchemaGraph:
 
             tooltip = f"<b>{node}</b>\n{node_data.get('description', '')}\n\n<b>컬럼:</b>\n{column_info}"
 
-            net.add_node(
-                node,
-                label=node,
-                title=tooltip,
-                color="#4A90D9",
-                size=30,
-            )
-
-        # 엣지 추가 (관계) - 중복 방지를 위해 한 방향만
-        added_edges = set()
-        for edge in self.graph.edges:
-            from_table, to_table = edge
-            edge_key = tuple(sorted([from_table, to_table]))
-
-            if edge_key not in added_edges:
-                edge_data = self.graph.edges[edge]
-                join_condition = edge_data.get("join_condition", "")
-                rel_type = edge_data.get("type", "")
-
-                # 엣지 라벨 (컬럼명만 표시)
-                label = join_condition.split("=")[0].split(".")[-1].strip() if join_condition else ""
+            nodes.append({
+                "id": node,
+                "label": node,
+                "title": tooltip,
+                "color": "#4A90D9",
+                "size": 30,
+                "shape": "dot",
+            })
 
-                net.add_edge(
-                    from_table,
-                    to_table,
-                    title=f"{join_condition}\n({rel_type})",
-                    label=label,
-                    color="#848484",
-                )
-                added_edges.add(edge_key)
+        # 엣지 (관계) - 메타데이터에 정의된 방향으로 표시
+        edges = []
+        for u, v, edge_data in self.graph.edges(data=True):
+            from_table = edge_data.get("from_table", u)
+            to_table = v if from_table == u else u
+            join_condition = edge_data.get("join_condition", "")
+            rel_type = edge_data.get("type", "")
+
+            # 엣지 라벨 (컬럼명만 표시)
+            label = join_condition.split("=")[0].split(".")[-1].strip() if join_condition else ""
+
+            edges.append({
+                "from": from_table,
+                "to": to_table,
+                "title": f"{join_condition}\n({rel_type})",
+                "label": label,
+                "color": "#848484",
+                "arrows": "to",
+            })
 
-        # HTML 파일 생성
-        net.write_html(str(output_file))
+        # HTML 파일 생성 (<script> 안에 삽입되므로 "</"는 이스케이프)
+        _graph_template().stream(
+            width="100%",
+            height="750px",
+            nodes_json=orjson.dumps(nodes).decode().replace("</", "<\\/"),
+            edges_json=orjson.dumps(edges).decode().replace("</", "<\\/"),
+        ).dump(str(output_file), encoding="utf-8")
 
         # 브라우저에서 열기
         if open_browser:
             webbrowser.open(f"file://{output_file.absolute()}")
 
         return str(output_file.absolute())
+
+
+@lru_cache(maxsize=1)
+def _graph_template():
+    """시각화 HTML 템플릿 (첫 호출 시 1회 컴파일)"""
+    from jinja2 import Environment, FileSystemLoader
+
+    env = Environment(loader=FileSystemLoader(Path(__file__).parent / "templates"))
+    return env.get_template("schema_graph.html.jinja")
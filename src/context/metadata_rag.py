@@ -1,28 +1,95 @@
 """YAML 메타데이터 기반 스키마 조회 모듈"""
 
-import yaml
+import sys
 from pathlib import Path
 from typing import Optional
 
+from ._loader import load_metadata_file, load_metadata_files
+from ._search import SubstringIndex
+
 
 class MetadataRAG:
     """YAML 메타데이터에서 스키마 정보를 조회하는 클래스"""
 
-    def __init__(self, metadata_path: str):
+    def __init__(self, metadata_path: str, metadata: Optional[dict] = None):
         """
         Args:
             metadata_path: schema_metadata.yaml 파일 경로
+            metadata: 이미 로드된 메타데이터 (from_paths 사용 시). None이면 파일에서 로드
         """
         self.metadata_path = Path(metadata_path)
-        self.metadata = self._load_metadata()
+        self.metadata = metadata if metadata is not None else self._load_metadata()
+        self._search_index = self._build_search_index()
+        self._rel_by_table, self._join_hints = self._build_relationship_index()
+        self._context_cache: Optional[str] = None
+
+    @classmethod
+    def from_paths(cls, paths: list) -> "MetadataRAG":
+        """
+        여러 메타데이터 YAML 파일(테이블별 분할 등)을 병렬로 로드해 생성
+
+        Args:
+            paths: YAML 파일 경로 목록 (metadata_path는 첫 번째 경로)
+
+        Returns:
+            MetadataRAG 인스턴스
+        """
+        return cls(paths[0], metadata=load_metadata_files(paths))
 
     def _load_metadata(self) -> dict:
         """YAML 파일 로드"""
-        if not self.metadata_path.exists():
-            raise FileNotFoundError(f"메타데이터 파일을 찾을 수 없습니다: {self.metadata_path}")
+        return load_metadata_file(self.metadata_path)
+
+    def _build_search_index(self) -> SubstringIndex:
+        """
+        키워드 검색용 인덱스 생성 (로드 시 1회)
+
+        테이블별로 테이블명/설명/컬럼명/컬럼 설명을 소문자로 변환해 하나의 문자열로 합쳐 둡니다.
+        필드/테이블 사이는 제어 문자로 구분하므로 경계를 넘는 오매칭이 없습니다.
 
-        with open(self.metadata_path, "r", encoding="utf-8") as f:
-            return yaml.safe_load(f)
+        Returns:
+            SubstringIndex
+        """
+        entries = []
+        for table_name, table_info in self.metadata.get("tables", {}).items():
+            fields = [table_name, table_info.get("description", "")]
+            for col in table_info.get("columns", []):
+                fields.append(col["name"])
+                fields.append(col.get("description", ""))
+            entries.append((table_name, fields))
+        return SubstringIndex(entries)
+
+    def _build_relationship_index(self) -> tuple[dict[str, list], dict[frozenset, dict]]:
+        """
+        관계 조회용 인덱스 생성 (로드 시 1회)
+
+        Returns:
+            (테이블명 -> 관련 관계 리스트, frozenset({테이블1, 테이블2}) -> 조인 힌트)
+            같은 테이블 쌍에 관계가 여러 개면 조인 힌트는 첫 번째 관계를 사용합니다.
+        """
+        rel_by_table: dict[str, list] = {}
+        join_hints: dict[frozenset, dict] = {}
+
+        for rel in self.metadata.get("relationships", []):
+            from_table = sys.intern(rel["from"].split(".")[0])
+            to_table = sys.intern(rel["to"].split(".")[0])
+
+            related = {
+                "from": rel["from"],
+                "to": rel["to"],
+                "type": rel.get("type", ""),
+                "description": rel.get("description", ""),
+            }
+            for table in dict.fromkeys((from_table, to_table)):  # 자기 참조 관계는 1번만
+                rel_by_table.setdefault(table, []).append(related)
+
+            join_hints.setdefault(frozenset((from_table, to_table)), {
+                "join_condition": f"{rel['from']} = {rel['to']}",
+                "type": rel.get("type", ""),
+                "description": rel.get("description", ""),
+            })
+
+        return rel_by_table, join_hints
 
     def get_table_info(self, table_name: str) -> Optional[dict]:
         """
@@ -53,23 +120,8 @@ class MetadataRAG:
         }
 
     def _get_relationships_for_table(self, table_name: str) -> list:
-        """테이블과 관련된 모든 관계 정보 추출"""
-        relationships = self.metadata.get("relationships", [])
-        related = []
-
-        for rel in relationships:
-            from_table = rel["from"].split(".")[0]
-            to_table = rel["to"].split(".")[0]
-
-            if from_table == table_name or to_table == table_name:
-                related.append({
-                    "from": rel["from"],
-                    "to": rel["to"],
-                    "type": rel.get("type", ""),
-                    "description": rel.get("description", ""),
-                })
-
-        return related
+        """테이블과 관련된 모든 관계 정보 추출 (미리 만든 인덱스 조회)"""
+        return list(self._rel_by_table.get(table_name, ()))
 
     def list_tables(self) -> list:
         """모든 테이블 목록 반환"""
@@ -85,22 +137,22 @@ class MetadataRAG:
     def get_all_schema_context(self) -> str:
         """
         전체 스키마를 컨텍스트 문자열로 반환
-        (LLM에 전달할 용도)
+        (LLM에 전달할 용도, 첫 호출 시 1회 생성 후 캐시)
         """
+        if self._context_cache is None:
+            self._context_cache = self._build_schema_context()
+        return self._context_cache
+
+    def _build_schema_context(self) -> str:
+        """get_all_schema_context 문자열 생성 (캐시 미스 시)"""
         lines = ["# 데이터베이스 스키마 정보\n"]
 
-        # 테이블 정보
+        # 테이블 정보 (테이블별 블록을 한 번에 포맷)
         tables = self.metadata.get("tables", {})
-        for table_name, table_info in tables.items():
-            lines.append(f"## 테이블: {table_name}")
-            lines.append(f"설명: {table_info.get('description', '')}")
-            lines.append(f"소스: {table_info.get('source', '')}")
-            lines.append("컬럼:")
-
-            for col in table_info.get("columns", []):
-                lines.append(f"  - {col['name']} ({col['type']}): {col.get('description', '')}")
-
-            lines.append("")
+        lines.extend(
+            self._format_table_block(table_name, table_info)
+            for table_name, table_info in tables.items()
+        )
 
         # 관계 정보
         relationships = self.metadata.get("relationships", [])
@@ -121,6 +173,21 @@ class MetadataRAG:
 
         return "\n".join(lines)
 
+    @staticmethod
+    def _format_table_block(table_name: str, table_info: dict) -> str:
+        """테이블 1개의 컨텍스트 블록 (헤더 + 컬럼 목록 + 빈 줄)"""
+        header = (
+            f"## 테이블: {table_name}\n"
+            f"설명: {table_info.get('description', '')}\n"
+            f"소스: {table_info.get('source', '')}\n"
+            "컬럼:"
+        )
+        columns = "".join(
+            f"\n  - {col['name']} ({col['type']}): {col.get('description', '')}"
+            for col in table_info.get("columns", [])
+        )
+        return f"{header}{columns}\n"
+
     def search_tables_by_keyword(self, keyword: str) -> list:
         """
         키워드로 관련 테이블 검색
@@ -132,28 +199,12 @@ class MetadataRAG:
             관련 테이블 정보 리스트
         """
         keyword_lower = keyword.lower()
-        results = []
 
-        tables = self.metadata.get("tables", {})
-        for table_name, table_info in tables.items():
-            # 테이블명, 설명, 컬럼명/설명에서 검색
-            matched = False
-
-            if keyword_lower in table_name.lower():
-                matched = True
-            elif keyword_lower in table_info.get("description", "").lower():
-                matched = True
-            else:
-                for col in table_info.get("columns", []):
-                    if keyword_lower in col["name"].lower():
-                        matched = True
-                        break
-                    if keyword_lower in col.get("description", "").lower():
-                        matched = True
-                        break
-
-            if matched:
-                results.append(self.get_table_info(table_name))
+        # 테이블명, 설명, 컬럼명/설명에서 검색 (미리 합쳐 둔 검색 문자열 사용)
+        results = [
+            self.get_table_info(table_name)
+            for table_name in self._search_index.search(keyword_lower)
+        ]
 
         # 비즈니스 용어 매핑도 검색
         glossary = self.metadata.get("business_glossary", {})
@@ -179,21 +230,5 @@ class MetadataRAG:
         Returns:
             조인 조건 정보 또는 None
         """
-        relationships = self.metadata.get("relationships", [])
-
-        for rel in relationships:
-            from_table = rel["from"].split(".")[0]
-            to_table = rel["to"].split(".")[0]
-            from_col = rel["from"].split(".")[1]
-            to_col = rel["to"].split(".")[1]
-
-            # 양방향으로 체크
-            if (from_table == table1 and to_table == table2) or \
-               (from_table == table2 and to_table == table1):
-                return {
-                    "join_condition": f"{rel['from']} = {rel['to']}",
-                    "type": rel.get("type", ""),
-                    "description": rel.get("description", ""),
-                }
-
-        return None
+        # 양방향 조회 (frozenset 키는 순서 무관)
+        return self._join_hints.get(frozenset((table1, table2)))
@@ -1,11 +1,30 @@
 """CSV 내보내기 모듈"""
 
+import codecs
+import csv
+import fnmatch
 import os
 from datetime import datetime
 from pathlib import Path
 from typing import Optional
 
-import pandas as pd
+from ..sql.result import ColumnarRows
+
+# Arrow CSV writer 사용 (미설치 환경에서는 pandas to_csv로 대체)
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pa_csv
+except ImportError:
+    pa = None
+
+# 이 행 수 미만의 list[dict]는 csv.DictWriter로 바로 기록 (DataFrame/Arrow 변환 생략)
+DICT_WRITER_MAX_ROWS = 50_000
+
+# 압축 형식 -> 파일 확장자 (export(compression=...))
+COMPRESSION_EXTENSIONS = {
+    "gzip": ".gz",
+    "zstd": ".zst",
+}
 
 
 class CSVExporter:
@@ -24,14 +43,16 @@ class CSVExporter:
         data: list,
         filename: Optional[str] = None,
         include_timestamp: bool = True,
+        compression: Optional[str] = None,
     ) -> dict:
         """
         데이터를 CSV 파일로 내보내기
 
         Args:
-            data: 내보낼 데이터 (list of dict)
+            data: 내보낼 데이터 (list of dict 또는 ColumnarRows)
             filename: 파일명 (확장자 제외). None이면 자동 생성
             include_timestamp: 파일명에 타임스탬프 포함 여부
+            compression: 압축 형식 ("gzip" → .csv.gz, "zstd" → .csv.zst). None이면 비압축
 
         Returns:
             {
@@ -52,6 +73,15 @@ class CSVExporter:
                     "error": "내보낼 데이터가 없습니다.",
                 }
 
+            if compression is not None and compression not in COMPRESSION_EXTENSIONS:
+                return {
+                    "success": False,
+                    "file_path": None,
+                    "row_count": 0,
+                    "file_size_bytes": 0,
+                    "error": f"지원하지 않는 압축 형식입니다: {compression} (gzip, zstd 중 선택)",
+                }
+
             # 파일명 생성
             if filename is None:
                 filename = "query_result"
@@ -60,11 +90,10 @@ class CSVExporter:
                 timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
                 filename = f"{filename}_{timestamp}"
 
-            file_path = self.output_dir / f"{filename}.csv"
+            extension = ".csv" + COMPRESSION_EXTENSIONS.get(compression, "")
+            file_path = self.output_dir / f"{filename}{extension}"
 
-            # DataFrame 변환 및 저장
-            df = pd.DataFrame(data)
-            df.to_csv(file_path, index=False, encoding="utf-8-sig")
+            self._write_csv(data, file_path, compression)
 
             file_size = file_path.stat().st_size
 
@@ -85,6 +114,52 @@ class CSVExporter:
                 "error": str(e),
             }
 
+    @staticmethod
+    def _write_csv(data: list, file_path: Path, compression: Optional[str] = None):
+        """
+        CSV 파일 기록 (UTF-8 BOM 포함, Excel 호환)
+
+        DICT_WRITER_MAX_ROWS 미만의 비압축 list[dict]는 csv.DictWriter로 원본 행을 그대로 기록합니다.
+        그 외에는 pyarrow가 있으면 Arrow CSV writer(C++)로 직렬화하고
+        (압축 시 CompressedOutputStream으로 스트리밍 압축),
+        미설치이거나 Arrow 변환이 불가능한 데이터(컬럼 내 타입 혼재 등)는 pandas로 기록합니다.
+        """
+        if (
+            compression is None
+            and not isinstance(data, ColumnarRows)
+            and len(data) < DICT_WRITER_MAX_ROWS
+        ):
+            with open(file_path, "w", newline="", encoding="utf-8-sig") as f:
+                writer = csv.DictWriter(f, fieldnames=list(data[0].keys()), lineterminator="\n")
+                writer.writeheader()
+                writer.writerows(data)
+            return
+
+        if pa is not None:
+            try:
+                table = data.to_arrow() if isinstance(data, ColumnarRows) else pa.Table.from_pylist(data)
+            except pa.ArrowException:
+                table = None
+
+            if table is not None:
+                if compression is None:
+                    sink = open(file_path, "wb")
+                else:
+                    sink = pa.CompressedOutputStream(str(file_path), compression)
+                with sink as f:
+                    f.write(codecs.BOM_UTF8)
+                    pa_csv.write_csv(table, f)
+                return
+
+        import pandas as pd
+
+        # DataFrame 변환 및 저장
+        if isinstance(data, ColumnarRows):
+            df = pd.DataFrame(data.columns)  # 열 단위 그대로 생성
+        else:
+            df = pd.DataFrame(data)
+        df.to_csv(file_path, index=False, encoding="utf-8-sig", compression=compression)
+
     def export_with_summary(
         self,
         data: list,
@@ -107,6 +182,8 @@ class CSVExporter:
         if not result["success"] or not data:
             return result
 
+        import pandas as pd
+
         # 요약 정보 생성
         df = pd.DataFrame(data)
 
@@ -117,23 +194,42 @@ class CSVExporter:
 
         # 숫자 컬럼 통계
         if summary_columns:
-            numeric_summary = {}
-            for col in summary_columns:
-                if col in df.columns:
-                    try:
-                        numeric_summary[col] = {
-                            "sum": float(df[col].sum()),
-                            "mean": float(df[col].mean()),
-                            "min": float(df[col].min()),
-                            "max": float(df[col].max()),
-                        }
-                    except (TypeError, ValueError):
-                        pass
-            summary["numeric_stats"] = numeric_summary
+            columns = [col for col in dict.fromkeys(summary_columns) if col in df.columns]
+            summary["numeric_stats"] = self._numeric_stats(df, columns)
 
         result["summary"] = summary
         return result
 
+    @staticmethod
+    def _numeric_stats(df, columns: list) -> dict:
+        """
+        컬럼별 sum/mean/min/max 계산
+
+        DataFrame.agg 한 번으로 전체 컬럼을 집계하고,
+        숫자가 아닌 컬럼이 섞여 실패하면 컬럼별로 집계해 해당 컬럼만 제외합니다.
+        """
+        funcs = ["sum", "mean", "min", "max"]
+
+        def to_floats(stats: dict) -> dict:
+            return {name: float(value) for name, value in stats.items()}
+
+        if not columns:
+            return {}
+
+        try:
+            stats = df[columns].agg(funcs).to_dict()
+            return {col: to_floats(stats[col]) for col in columns}
+        except (TypeError, ValueError):
+            pass
+
+        numeric_summary = {}
+        for col in columns:
+            try:
+                numeric_summary[col] = to_floats(df[col].agg(funcs).to_dict())
+            except (TypeError, ValueError):
+                pass
+        return numeric_summary
+
     def list_exports(self, pattern: str = "*.csv") -> list:
         """
         내보낸 파일 목록 조회
@@ -144,53 +240,65 @@ class CSVExporter:
         Returns:
             파일 정보 리스트
         """
-        files = []
-        for file_path in self.output_dir.glob(pattern):
-            stat = file_path.stat()
-            files.append({
-                "filename": file_path.name,
-                "path": str(file_path.absolute()),
+        # scandir 엔트리는 stat 결과를 캐시하므로 파일당 stat 호출은 1회
+        with os.scandir(self.output_dir) as it:
+            entries = [
+                (entry, entry.stat())
+                for entry in it
+                if fnmatch.fnmatch(entry.name, pattern) and entry.is_file()
+            ]
+
+        # 최신순 정렬 (mtime 숫자 비교)
+        entries.sort(key=lambda x: x[1].st_mtime, reverse=True)
+
+        return [
+            {
+                "filename": entry.name,
+                "path": os.path.abspath(entry.path),
                 "size_bytes": stat.st_size,
                 "created_at": datetime.fromtimestamp(stat.st_ctime).isoformat(),
                 "modified_at": datetime.fromtimestamp(stat.st_mtime).isoformat(),
-            })
-
-        # 최신순 정렬
-        files.sort(key=lambda x: x["modified_at"], reverse=True)
-        return files
+            }
+            for entry, stat in entries
+        ]
 
-    def cleanup_old_files(self, keep_count: int = 10) -> dict:
+    def cleanup_old_files(self, keep_count: int = 10, pattern: str = "*.csv") -> dict:
         """
         오래된 파일 정리
 
+        list_exports()의 결과 dict 포맷 없이 scandir 엔트리를 mtime으로 정렬해 바로 삭제합니다.
+
         Args:
             keep_count: 유지할 최근 파일 수
+            pattern: 정리 대상 파일 패턴 (기본: *.csv)
 
         Returns:
             {
                 "deleted_count": int,
-                "deleted_files": list[str]
+                "deleted_files": list[str],
+                "failed_files": list[{"filename": str, "error": str}]
             }
         """
-        files = self.list_exports()
+        with os.scandir(self.output_dir) as it:
+            entries = [
+                entry for entry in it
+                if fnmatch.fnmatch(entry.name, pattern) and entry.is_file()
+            ]
 
-        if len(files) <= keep_count:
-            return {
-                "deleted_count": 0,
-                "deleted_files": [],
-            }
+        # 최신순 정렬 후 keep_count 이후 파일 삭제
+        entries.sort(key=lambda entry: entry.stat().st_mtime, reverse=True)
 
-        files_to_delete = files[keep_count:]
         deleted_files = []
-
-        for file_info in files_to_delete:
+        failed_files = []
+        for entry in entries[keep_count:]:
             try:
-                os.remove(file_info["path"])
-                deleted_files.append(file_info["filename"])
-            except Exception as e:
-                print(f"파일 삭제 실패: {file_info['filename']} - {e}")
+                os.unlink(entry.path)
+                deleted_files.append(entry.name)
+            except OSError as e:
+                failed_files.append({"filename": entry.name, "error": str(e)})
 
         return {
             "deleted_count": len(deleted_files),
             "deleted_files": deleted_files,
+            "failed_files": failed_files,
         }
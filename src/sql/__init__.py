@@ -1,4 +1,23 @@
-from .validator import SQLValidator
-from .executor import ParallelExecutor
+# 하위 모듈은 실제로 이름에 접근할 때 로드합니다 (PEP 562).
+# ColumnarRows만 사용하는 경우 pymysql을 import하지 않습니다.
+from importlib import import_module
 
-__all__ = ["SQLValidator", "ParallelExecutor"]
+_EXPORTS = {
+    "SQLValidator": ".validator",
+    "ParallelExecutor": ".executor",
+    "ColumnarRows": ".result",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(_EXPORTS[name], __name__), name)
+    globals()[name] = value  # 이후 접근은 모듈 속성으로 바로 조회
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,92 @@
+"""PyMySQL 연결 풀 (ParallelExecutor / SQLValidator 공용)"""
+
+import queue
+import threading
+from contextlib import contextmanager
+
+import pymysql
+
+# 서버가 쿼리를 거부한 오류 (연결은 정상이므로 재사용 가능)
+_QUERY_ERRORS = (
+    pymysql.err.ProgrammingError,
+    pymysql.err.DataError,
+    pymysql.err.IntegrityError,
+    pymysql.err.NotSupportedError,
+)
+
+
+class ConnectionPool:
+    """
+    스레드 간 공유하는 PyMySQL 연결 풀
+
+    최대 size개의 연결을 필요할 때 생성하고, 사용 후 반납된 연결을 재사용합니다.
+    (쿼리/파티션마다 TCP 연결 + 인증을 반복하지 않음)
+    """
+
+    def __init__(self, config: dict, size: int):
+        """
+        Args:
+            config: PyMySQL 연결 설정
+            size: 최대 연결 수 (초과 요청은 반납될 때까지 대기)
+        """
+        self.config = config
+        self._idle: queue.LifoQueue = queue.LifoQueue()  # 최근 사용 연결 우선
+        self._slots = threading.BoundedSemaphore(size)
+        self._closed = False
+
+    @contextmanager
+    def connection(self):
+        """
+        연결 대여 (with 블록 종료 시 반납)
+
+        쿼리 자체의 오류(문법/테이블 없음 등)는 연결을 반납하고,
+        그 외 예외가 발생하면 해당 연결은 폐기합니다.
+        """
+        self._slots.acquire()
+        try:
+            conn = self._checkout()
+            try:
+                yield conn
+            except _QUERY_ERRORS:
+                # 서버가 쿼리를 거부한 경우 연결 상태는 정상이므로 반납
+                self._release(conn)
+                raise
+            except BaseException:
+                # 연결 오류 / 결과를 다 읽지 않은 상태 등 → 재사용하지 않고 폐기
+                conn.close()
+                raise
+
+            self._release(conn)
+        finally:
+            self._slots.release()
+
+    def _release(self, conn: pymysql.Connection):
+        """사용한 연결 반납 (풀 종료 후에는 닫음)"""
+        if self._closed or not conn.open:
+            conn.close()
+        else:
+            self._idle.put(conn)
+
+    def _checkout(self) -> pymysql.Connection:
+        """유휴 연결 반환 (없거나 끊겼으면 새로 연결)"""
+        try:
+            conn = self._idle.get_nowait()
+        except queue.Empty:
+            return pymysql.connect(**self.config)
+
+        try:
+            conn.ping(reconnect=True)  # 서버 측 idle timeout으로 끊긴 연결 복구
+        except pymysql.err.Error:
+            conn.close()
+            return pymysql.connect(**self.config)
+        return conn
+
+    def close(self):
+        """유휴 연결 모두 종료 (대여 중인 연결은 반납 시 종료)"""
+        self._closed = True
+        while True:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            conn.close()
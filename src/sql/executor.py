@@ -1,37 +1,207 @@
 """SQL 실행 모듈 - 병렬 처리 지원"""
 
+import asyncio
+import functools
+import itertools
 import re
+import threading
+import time
+from contextlib import contextmanager
 from datetime import datetime, timedelta
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from typing import Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterator, Literal, Optional
 
 import pymysql
+from anyio.from_thread import start_blocking_portal
+
+from ._pool import ConnectionPool
+
+# 비동기 파티션 실행용 (미설치 환경에서는 스레드 풀로 실행)
+try:
+    import aiomysql
+except ImportError:
+    aiomysql = None
+
+# 서버 측 커서(SSDictCursor) 사용 시 한 번에 가져올 행 수
+FETCH_BATCH_SIZE = 1000
+
+# execute 결과 data 형식
+# - dict: list[dict] (행마다 dict)
+# - tuple: {"columns": [컬럼명, ...], "rows": list[tuple]} (행 dict 생성 생략)
+# - columnar: {컬럼명: [값, ...]} (열 단위, ColumnarRows / pandas.DataFrame 입력 형식)
+RowFormat = Literal["dict", "tuple", "columnar"]
+
+# 날짜 범위 패턴 (모듈 로드 시 1회 컴파일)
+# 날짜 리터럴: 'YYYY-MM-DD' 또는 'YYYY-MM-DD HH:MM:SS[.ffffff]' (시각 포함 범위는 월 분할하지 않음)
+_DATE_LITERAL = r"\d{4}-\d{2}-\d{2}(?:[ T]\d{2}:\d{2}:\d{2}(?:\.\d+)?)?"
+# - BETWEEN 'YYYY-MM-DD' AND 'YYYY-MM-DD'
+#   (월 분할 치환용이므로 날짜만 있는 리터럴만 매칭 - 시각이 있는 다른 조건은 그대로 둠)
+_BETWEEN_RE = re.compile(
+    r"BETWEEN\s+'(\d{4}-\d{2}-\d{2})'\s+AND\s+'(\d{4}-\d{2}-\d{2})'",
+    re.IGNORECASE,
+)
+# - BETWEEN 또는 >= 'YYYY-MM-DD' AND col <= 'YYYY-MM-DD' (파티션 감지용 단일 스캔)
+_DATE_RANGE_RE = re.compile(
+    r"(?:BETWEEN\s+'(?P<b1>" + _DATE_LITERAL + r")'\s+AND\s+'(?P<b2>" + _DATE_LITERAL + r")')"
+    r"|(?:>=\s*'(?P<r1>" + _DATE_LITERAL + r")'\s+AND\s+\w+\s*<=\s*'(?P<r2>" + _DATE_LITERAL + r")')",
+    re.IGNORECASE,
+)
+# - >= AND <= 치환용 (연산자/중간 부분을 그룹으로 보존, _BETWEEN_RE와 같이 날짜만 매칭)
+_RANGE_SUB_RE = re.compile(
+    r"(>=\s*)'(\d{4}-\d{2}-\d{2})'(\s+AND\s+\w+\s*<=\s*)'(\d{4}-\d{2}-\d{2})'",
+    re.IGNORECASE,
+)
+# - 기존 LIMIT 절
+_LIMIT_RE = re.compile(r"\bLIMIT\s+\d+", re.IGNORECASE)
+
+
+@functools.lru_cache(maxsize=256)
+def _enumerate_months(start_str: str, end_str: str) -> tuple[tuple[str, str], ...]:
+    """
+    날짜 범위를 월별 (시작일, 종료일) 구간으로 분할 (같은 범위는 캐시 재사용)
+
+    Args:
+        start_str: 시작일 (YYYY-MM-DD)
+        end_str: 종료일 (YYYY-MM-DD)
+
+    Returns:
+        ((시작일, 종료일), ...) / 날짜 범위가 30일 이하면 빈 튜플 (파티션 안 함)
+    """
+    start = datetime.strptime(start_str, "%Y-%m-%d")
+    end = datetime.strptime(end_str, "%Y-%m-%d")
+
+    # 날짜 범위가 30일 이하면 파티션 안 함
+    if (end - start).days <= 30:
+        return ()
+
+    # 월별 파티션 생성
+    partitions = []
+    current = start.replace(day=1)
+
+    while current <= end:
+        # 다음 달 1일
+        if current.month == 12:
+            next_month = current.replace(year=current.year + 1, month=1)
+        else:
+            next_month = current.replace(month=current.month + 1)
+
+        # 파티션 종료일 (다음달 1일 - 1일 또는 end 중 작은 값)
+        partition_end = min(next_month - timedelta(days=1), end)
+
+        # 파티션 시작일 (current 또는 start 중 큰 값)
+        partition_start = max(current, start)
+
+        partitions.append((
+            partition_start.strftime("%Y-%m-%d"),
+            partition_end.strftime("%Y-%m-%d"),
+        ))
+
+        current = next_month
+
+    return tuple(partitions)
+
+
+class RowLimitExceeded(RuntimeError):
+    """결과 행 수가 max_rows를 넘은 경우 (부분 결과를 반환하지 않고 실행 중단)"""
 
 
 class ParallelExecutor:
     """병렬 SQL 실행 클래스"""
 
-    def __init__(self, connection_config: dict, max_workers: int = 4):
+    def __init__(
+        self,
+        connection_config: dict,
+        max_workers: int = 4,
+        use_ss_cursor: bool = False,
+        partition_column_hint: Optional[str] = None,
+        use_async_io: bool = False,
+        row_format: RowFormat = "dict",
+        max_rows: Optional[int] = None,
+    ):
         """
         Args:
             connection_config: PyMySQL 연결 설정
-            max_workers: 최대 병렬 워커 수
+            max_workers: 최대 병렬 워커 수 (연결 풀 크기)
+            use_ss_cursor: 서버 측 커서(SSDictCursor)로 결과를 나눠 받을지 여부 (execute 기본값)
+                대용량 파티션 결과를 클라이언트 버퍼에 한 번에 올리지 않습니다.
+            partition_column_hint: 테이블 파티션 키 컬럼명 (예: "usage_date")
+                지정하면 날짜 범위를 월별로 나눠 여러 번 실행하는 대신,
+                같은 범위 조건을 파티션 키에 추가한 단일 쿼리로 실행해 DB의 파티션 pruning에 맡깁니다.
+            use_async_io: 파티션 병렬 실행을 aiomysql + 전용 이벤트 루프 1개로 처리할지 여부
+                (파티션마다 스레드를 점유하지 않음, aiomysql 미설치 시 스레드 풀 사용)
+            row_format: execute 결과 data 형식 ("dict" | "tuple" | "columnar", RowFormat 참고)
+                tuple/columnar는 튜플 커서로 받아 행마다 dict를 만들지 않습니다.
+            max_rows: 쿼리 1개의 최대 결과 행 수 (None이면 제한 없음)
+                지정하면 항상 서버 측 커서로 나눠 받고, 초과하는 즉시 실행을 중단합니다.
+                (LIMIT 없는 대용량 쿼리로 메모리가 부족해지는 것 방지)
         """
+        if row_format not in ("dict", "tuple", "columnar"):
+            raise ValueError(f"지원하지 않는 row_format입니다: {row_format}")
+
         self.config = connection_config
         self.max_workers = max_workers
-
-    def execute(self, sql: str, parallel: bool = True) -> dict:
+        self.use_ss_cursor = use_ss_cursor
+        self.partition_column_hint = partition_column_hint
+        self.row_format = row_format
+        self.max_rows = max_rows
+        # 파티션 워커가 대기 없이 연결을 얻도록 풀 크기 = max_workers
+        self._pool = ConnectionPool(connection_config, max_workers)
+        # 파티션 실행 스레드 풀 (첫 병렬 실행 시 생성, 이후 쿼리 간 재사용)
+        self._tpool: Optional[ThreadPoolExecutor] = None
+        self._tpool_lock = threading.Lock()
+        # 비동기 파티션 실행용 전용 이벤트 루프 / aiomysql 연결 풀 (첫 병렬 실행 시 생성)
+        self.use_async_io = use_async_io and aiomysql is not None
+        self._portal = None
+        self._portal_cm = None
+        self._apool = None
+        self._portal_lock = threading.Lock()
+
+    def _get_portal(self):
+        """비동기 파티션 실행용 portal 반환 (lazy 생성, aiomysql 풀도 함께 생성)"""
+        with self._portal_lock:
+            if self._portal is None:
+                portal_cm = start_blocking_portal()
+                portal = portal_cm.__enter__()
+                try:
+                    self._apool = portal.call(self._create_async_pool)
+                except BaseException:
+                    portal_cm.__exit__(None, None, None)
+                    raise
+                self._portal_cm, self._portal = portal_cm, portal
+            return self._portal
+
+    async def _create_async_pool(self):
+        """aiomysql 연결 풀 생성 (PyMySQL 설정의 database 키는 db로 변환)"""
+        config = dict(self.config)
+        if "database" in config:
+            config["db"] = config.pop("database")
+        return await aiomysql.create_pool(maxsize=self.max_workers, **config)
+
+    async def _close_async_pool(self):
+        """aiomysql 연결 풀 종료"""
+        self._apool.close()
+        await self._apool.wait_closed()
+
+    def _get_thread_pool(self) -> ThreadPoolExecutor:
+        """파티션 실행 스레드 풀 반환 (lazy 생성)"""
+        with self._tpool_lock:
+            if self._tpool is None:
+                self._tpool = ThreadPoolExecutor(max_workers=self.max_workers)
+            return self._tpool
+
+    def execute(self, sql: str, parallel: bool = True, use_ss_cursor: Optional[bool] = None) -> dict:
         """
         SQL 쿼리 실행
 
         Args:
             sql: 실행할 SQL 쿼리
             parallel: 병렬 실행 여부
+            use_ss_cursor: 서버 측 커서 사용 여부 (None이면 생성 시 설정값)
 
         Returns:
             {
                 "success": bool,
-                "data": list[dict],  # 결과 행들
+                "data": list[dict] | dict,  # 결과 행들 (row_format에 따른 형식)
                 "row_count": int,
                 "error": str | None,
                 "execution_info": {
@@ -41,17 +211,22 @@ class ParallelExecutor:
                 }
             }
         """
-        start_time = datetime.now()
+        start_ns = time.perf_counter_ns()
+        if use_ss_cursor is None:
+            use_ss_cursor = self.use_ss_cursor
+        if self.max_rows is not None:
+            # 행 수 제한은 스트리밍으로 받아야 초과 전에 중단 가능 (버퍼링 커서는 전체를 먼저 받음)
+            use_ss_cursor = True
 
         try:
             if not parallel:
-                data = self._execute_single(sql)
-                elapsed = (datetime.now() - start_time).total_seconds() * 1000
+                columns, rows = self._execute_single(sql, use_ss_cursor)
+                elapsed = (time.perf_counter_ns() - start_ns) / 1e6
 
                 return {
                     "success": True,
-                    "data": data,
-                    "row_count": len(data),
+                    "data": self._format_rows(columns, rows),
+                    "row_count": len(rows),
                     "error": None,
                     "execution_info": {
                         "parallel": False,
@@ -60,17 +235,22 @@ class ParallelExecutor:
                     },
                 }
 
-            # 날짜 기반 파티션 감지
-            partitions = self._detect_partitions(sql)
+            if self.partition_column_hint:
+                # 파티션 키 조건을 추가해 DB 파티션 pruning으로 단일 실행 (클라이언트 월 분할 없음)
+                sql = self._add_partition_predicate(sql)
+                partitions = [None]
+            else:
+                # 날짜 기반 파티션 감지
+                partitions = self._detect_partitions(sql)
 
             if len(partitions) <= 1:
-                data = self._execute_single(sql)
-                elapsed = (datetime.now() - start_time).total_seconds() * 1000
+                columns, rows = self._execute_single(sql, use_ss_cursor)
+                elapsed = (time.perf_counter_ns() - start_ns) / 1e6
 
                 return {
                     "success": True,
-                    "data": data,
-                    "row_count": len(data),
+                    "data": self._format_rows(columns, rows),
+                    "row_count": len(rows),
                     "error": None,
                     "execution_info": {
                         "parallel": False,
@@ -80,13 +260,13 @@ class ParallelExecutor:
                 }
 
             # 병렬 실행
-            data = self._execute_parallel(sql, partitions)
-            elapsed = (datetime.now() - start_time).total_seconds() * 1000
+            columns, rows = self._execute_parallel(sql, partitions, use_ss_cursor)
+            elapsed = (time.perf_counter_ns() - start_ns) / 1e6
 
             return {
                 "success": True,
-                "data": data,
-                "row_count": len(data),
+                "data": self._format_rows(columns, rows),
+                "row_count": len(rows),
                 "error": None,
                 "execution_info": {
                     "parallel": True,
@@ -96,11 +276,11 @@ class ParallelExecutor:
             }
 
         except Exception as e:
-            elapsed = (datetime.now() - start_time).total_seconds() * 1000
+            elapsed = (time.perf_counter_ns() - start_ns) / 1e6
 
             return {
                 "success": False,
-                "data": [],
+                "data": self._format_rows([], []),
                 "row_count": 0,
                 "error": str(e),
                 "execution_info": {
@@ -117,115 +297,303 @@ class ParallelExecutor:
         지원하는 패턴:
         - BETWEEN 'YYYY-MM-DD' AND 'YYYY-MM-DD'
         - >= 'YYYY-MM-DD' AND <= 'YYYY-MM-DD'
+        (시각이 포함된 리터럴은 분할하지 않고 단일 실행)
         """
-        # BETWEEN 패턴
-        between_pattern = r"BETWEEN\s+'(\d{4}-\d{2}-\d{2})'\s+AND\s+'(\d{4}-\d{2}-\d{2})'"
-        match = re.search(between_pattern, sql, re.IGNORECASE)
+        date_range = self._match_date_range(sql)
+        if date_range is None:
+            return [None]
 
-        if not match:
-            # >= AND <= 패턴
-            range_pattern = r">=\s*'(\d{4}-\d{2}-\d{2})'\s+AND\s+\w+\s*<=\s*'(\d{4}-\d{2}-\d{2})'"
-            match = re.search(range_pattern, sql, re.IGNORECASE)
+        start, end, _ = date_range
 
-        if not match:
+        # 시각이 포함된 범위는 분할하지 않음
+        # (월말 경계가 날짜만이면 DATETIME 컬럼에서 <= 'YYYY-MM-DD'가 자정까지만 포함해 행이 누락됨)
+        if len(start) > 10 or len(end) > 10:
             return [None]
 
-        start = datetime.strptime(match.group(1), "%Y-%m-%d")
-        end = datetime.strptime(match.group(2), "%Y-%m-%d")
-
-        # 날짜 범위가 30일 이하면 파티션 안 함
-        if (end - start).days <= 30:
+        months = _enumerate_months(start, end)
+        if not months:
             return [None]
 
-        # 월별 파티션 생성
-        partitions = []
-        current = start.replace(day=1)
+        return [{"start": m_start, "end": m_end} for m_start, m_end in months]
 
-        while current <= end:
-            # 다음 달 1일
-            if current.month == 12:
-                next_month = current.replace(year=current.year + 1, month=1)
-            else:
-                next_month = current.replace(month=current.month + 1)
+    def _match_date_range(self, sql: str) -> Optional[tuple[str, str, int]]:
+        """
+        SQL의 날짜 범위 조건 검색
 
-            # 파티션 종료일 (다음달 1일 - 1일 또는 end 중 작은 값)
-            partition_end = min(next_month - timedelta(days=1), end)
+        BETWEEN / >= AND <= 패턴을 한 번에 검색합니다 (날짜 범위가 없는 SQL은 1회 스캔).
+        >= AND <= 가 먼저 나와도 뒤에 BETWEEN이 있으면 BETWEEN 우선 (_parameterize_date_range와 동일).
 
-            # 파티션 시작일 (current 또는 start 중 큰 값)
-            partition_start = max(current, start)
+        Returns:
+            (시작일, 종료일, 조건 끝 위치) 또는 None
+        """
+        # 날짜 범위 조건이 없는 SQL(대부분)은 정규식 없이 부분 문자열 검사로 바로 제외
+        if ">=" not in sql and "between" not in sql.lower():
+            return None
 
-            partitions.append({
-                "start": partition_start.strftime("%Y-%m-%d"),
-                "end": partition_end.strftime("%Y-%m-%d"),
-            })
+        match = _DATE_RANGE_RE.search(sql)
+        if not match:
+            return None
 
-            current = next_month
+        if match.group("b1"):
+            return match.group("b1"), match.group("b2"), match.end()
 
-        return partitions
+        between = _BETWEEN_RE.search(sql, match.end())
+        if between:
+            return between.group(1), between.group(2), between.end()
 
-    def _execute_parallel(self, sql: str, partitions: list) -> list:
-        """파티션별 병렬 실행"""
-        results = []
-        errors = []
+        return match.group("r1"), match.group("r2"), match.end()
 
-        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
-            futures = {}
+    def _add_partition_predicate(self, sql: str) -> str:
+        """
+        날짜 범위 조건 바로 뒤에 파티션 키 범위 조건 추가
 
-            for partition in partitions:
-                partition_sql = self._replace_date_range(
-                    sql,
-                    partition["start"],
-                    partition["end"],
-                )
-                future = executor.submit(self._execute_single, partition_sql)
-                futures[future] = partition
+        예: usage_date BETWEEN '2024-01-01' AND '2024-06-30'
+            → ... AND {partition_column_hint} BETWEEN '2024-01-01' AND '2024-06-30'
+        날짜 범위 조건이 없으면 SQL을 그대로 반환합니다.
+        """
+        date_range = self._match_date_range(sql)
+        if date_range is None:
+            return sql
+
+        start, end, pos = date_range
+        predicate = f" AND {self.partition_column_hint} BETWEEN '{start}' AND '{end}'"
+        return sql[:pos] + predicate + sql[pos:]
+
+    def _execute_parallel(self, sql: str, partitions: list, use_ss_cursor: bool = False) -> tuple[list, list]:
+        """
+        파티션별 병렬 실행
+
+        파티션별 결과 리스트를 파티션 순서대로 모아 마지막에 한 번만 이어 붙입니다.
+        (완료 순서와 무관하게 결과 행은 날짜 파티션 순서 유지, as_completed 대기 객체 생성 없음)
+
+        Returns:
+            (컬럼명 리스트, 결과 행 리스트)
+        """
+        results_chunks = [None] * len(partitions)
+        errors = []
 
-            for future in as_completed(futures):
-                partition = futures[future]
+        # 날짜 범위만 다른 파티션 쿼리는 템플릿 1개 + 파티션별 파라미터로 실행
+        template, range_count = self._parameterize_date_range(sql)
+        params_list = [
+            (partition["start"], partition["end"]) * range_count
+            for partition in partitions
+        ]
+
+        if self.use_async_io:
+            # 전용 이벤트 루프에서 모든 파티션을 동시에 실행 (예외는 파티션별 결과로 반환)
+            outcomes = self._get_portal().call(
+                self._execute_parallel_async, template, params_list, use_ss_cursor
+            )
+            for idx, outcome in enumerate(outcomes):
+                if isinstance(outcome, RowLimitExceeded):
+                    raise outcome
+                if isinstance(outcome, Exception):
+                    errors.append(f"Partition {partitions[idx]}: {outcome}")
+                else:
+                    results_chunks[idx] = outcome
+        else:
+            executor = self._get_thread_pool()
+            futures = [
+                executor.submit(self._execute_single, template, use_ss_cursor, params)
+                for params in params_list
+            ]
+
+            # 제출 순서대로 결과 수집 (result()가 필요한 만큼만 대기)
+            for idx, future in enumerate(futures):
                 try:
-                    result = future.result()
-                    results.extend(result)
+                    results_chunks[idx] = future.result()
+                except RowLimitExceeded:
+                    # 행 수 초과는 부분 결과로 돌려주지 않고 실패 처리
+                    raise
                 except Exception as e:
-                    errors.append(f"Partition {partition}: {e}")
+                    errors.append(f"Partition {partitions[idx]}: {e}")
 
         if errors:
             # 일부 파티션 실패 시 경고 로깅 (결과는 반환)
             print(f"[Warning] 일부 파티션 실행 실패: {errors}")
 
-        return results
+        # 파티션 쿼리는 같은 템플릿이므로 컬럼은 성공한 첫 파티션 기준
+        succeeded = [chunk for chunk in results_chunks if chunk is not None]
+        columns = succeeded[0][0] if succeeded else []
 
-    def _replace_date_range(self, sql: str, start: str, end: str) -> str:
-        """SQL의 날짜 범위를 파티션 범위로 치환"""
-        # BETWEEN 패턴
-        between_pattern = r"BETWEEN\s+'(\d{4}-\d{2}-\d{2})'\s+AND\s+'(\d{4}-\d{2}-\d{2})'"
-        replaced = re.sub(
-            between_pattern,
-            f"BETWEEN '{start}' AND '{end}'",
-            sql,
-            flags=re.IGNORECASE,
-        )
+        # 파티션별로는 제한 이내여도 합친 결과가 넘으면 중단 (병합 전에 확인)
+        if self.max_rows is not None and sum(len(rows) for _, rows in succeeded) > self.max_rows:
+            raise RowLimitExceeded(f"row limit {self.max_rows} exceeded")
+        return columns, list(itertools.chain.from_iterable(rows for _, rows in succeeded))
+
+    async def _execute_parallel_async(self, template: str, params_list: list, use_ss_cursor: bool) -> list:
+        """
+        aiomysql 연결 풀로 파티션 쿼리 동시 실행
+
+        Returns:
+            파티션 순서대로 (컬럼명 리스트, 결과 행 리스트) 또는 예외 객체
+        """
+        if self.row_format == "dict":
+            cursor_class = aiomysql.SSDictCursor if use_ss_cursor else aiomysql.DictCursor
+        else:
+            cursor_class = aiomysql.SSCursor if use_ss_cursor else aiomysql.Cursor
+
+        async def run(params: tuple) -> tuple[list, list]:
+            async with self._apool.acquire() as conn:
+                cursor = await conn.cursor(cursor_class)
+                await cursor.execute(template, params)
+                if not use_ss_cursor:
+                    rows = list(await cursor.fetchall())
+                else:
+                    rows = []
+                    while batch := await cursor.fetchmany(self._fetch_size(len(rows))):
+                        rows.extend(batch)
+                        if self.max_rows is not None and len(rows) > self.max_rows:
+                            # 남은 결과를 읽지 않도록 연결을 닫고 중단 (풀에서 제거됨)
+                            conn.close()
+                            raise RowLimitExceeded(f"row limit {self.max_rows} exceeded")
+                await cursor.close()
+                return self._column_names(cursor), rows
+
+        return await asyncio.gather(*(run(params) for params in params_list), return_exceptions=True)
+
+    def _parameterize_date_range(self, sql: str) -> tuple[str, int]:
+        """
+        SQL의 날짜 범위 리터럴을 %s 플레이스홀더로 바꾼 템플릿 생성
 
-        if replaced != sql:
-            return replaced
+        파티션마다 정규식 치환을 반복하지 않고, 템플릿 1개에 파티션별 (시작일, 종료일)만 바인딩합니다.
+        BETWEEN이 있으면 BETWEEN 조건 전체, 없으면 >= AND <= 조건 전체를 치환합니다.
+        SQL 안의 기존 %(LIKE '%...%' 등)는 %%로 이스케이프합니다.
+
+        Returns:
+            (템플릿 SQL, 치환된 날짜 범위 조건 수)
+        """
+        match = _DATE_RANGE_RE.search(sql)
+        if match is None:
+            return sql, 0
+
+        escaped = sql.replace("%", "%%")
+
+        # BETWEEN 패턴
+        if match.group("b1") or _BETWEEN_RE.search(sql, match.end()):
+            return _BETWEEN_RE.subn("BETWEEN %s AND %s", escaped)
 
         # >= AND <= 패턴
-        range_pattern = r"(>=\s*)'(\d{4}-\d{2}-\d{2})'(\s+AND\s+\w+\s*<=\s*)'(\d{4}-\d{2}-\d{2})'"
-        return re.sub(
-            range_pattern,
-            rf"\g<1>'{start}'\g<3>'{end}'",
-            sql,
-            flags=re.IGNORECASE,
-        )
-
-    def _execute_single(self, sql: str) -> list:
-        """단일 쿼리 실행"""
-        conn = pymysql.connect(**self.config)
+        return _RANGE_SUB_RE.subn(r"\g<1>%s\g<3>%s", escaped)
+
+    def _execute_single(
+        self, sql: str, use_ss_cursor: bool = False, params: Optional[tuple] = None
+    ) -> tuple[list, list]:
+        """
+        단일 쿼리 실행 (연결 풀에서 연결 대여)
+
+        use_ss_cursor면 서버 측 커서로 FETCH_BATCH_SIZE 단위로 받아
+        클라이언트 버퍼에 전체 결과를 한 번에 올리지 않습니다.
+        row_format이 dict가 아니면 튜플 커서로 받습니다.
+
+        Args:
+            sql: 실행할 SQL (params가 있으면 %s 플레이스홀더 템플릿)
+            use_ss_cursor: 서버 측 커서 사용 여부
+            params: 플레이스홀더에 바인딩할 값
+
+        Returns:
+            (컬럼명 리스트, 결과 행 리스트)
+        """
+        if self.row_format == "dict":
+            cursor_class = pymysql.cursors.SSDictCursor if use_ss_cursor else pymysql.cursors.DictCursor
+        else:
+            cursor_class = pymysql.cursors.SSCursor if use_ss_cursor else pymysql.cursors.Cursor
+
+        with self._pool.connection() as conn:
+            cursor = conn.cursor(cursor_class)
+            cursor.execute(sql, params)
+            if not use_ss_cursor:
+                rows = list(cursor.fetchall())
+            else:
+                rows = []
+                while batch := cursor.fetchmany(self._fetch_size(len(rows))):
+                    rows.extend(batch)
+                    if self.max_rows is not None and len(rows) > self.max_rows:
+                        # 커서를 닫으면 남은 결과를 끝까지 읽으므로 닫지 않고 중단
+                        # (읽다 만 연결은 풀에서 폐기됨)
+                        raise RowLimitExceeded(f"row limit {self.max_rows} exceeded")
+            cursor.close()
+            return self._column_names(cursor), rows
+
+    def _fetch_size(self, fetched: int) -> int:
+        """다음 fetchmany 크기 (max_rows가 있으면 초과 여부를 알 수 있는 만큼만 요청)"""
+        if self.max_rows is None:
+            return FETCH_BATCH_SIZE
+        return max(1, min(FETCH_BATCH_SIZE, self.max_rows + 1 - fetched))
+
+    @staticmethod
+    def _column_names(cursor) -> list:
+        """커서 description에서 컬럼명 목록 추출"""
+        return [desc[0] for desc in cursor.description or ()]
+
+    def _format_rows(self, columns: list, rows: list):
+        """
+        실행 결과를 row_format 형식의 data로 변환
+
+        Args:
+            columns: 컬럼명 리스트
+            rows: 결과 행 리스트 (dict 형식이면 dict 행, 그 외에는 튜플 행)
+        """
+        if self.row_format == "dict":
+            return rows
+        if self.row_format == "tuple":
+            return {"columns": columns, "rows": rows}
+
+        # columnar: 행 튜플을 열 리스트로 전치 (빈 결과도 컬럼 키는 유지)
+        values = zip(*rows) if rows else ([] for _ in columns)
+        return {name: list(col) for name, col in zip(columns, values)}
+
+    @contextmanager
+    def execute_iter(self, sql: str, batch_size: int = FETCH_BATCH_SIZE, partitioned: bool = False):
+        """
+        서버 측 커서로 결과를 batch_size 행 단위 배치로 스트리밍
+
+            with executor.execute_iter(sql) as batches:
+                for rows in batches:  # rows: list[dict]
+                    ...
+
+        전체 결과를 메모리에 올리지 않고, 첫 배치를 바로 받을 수 있습니다.
+        with 블록을 벗어나면 커서/연결이 정리됩니다.
+        (중간에 멈추면 남은 결과를 읽지 않고 연결을 닫음 - 풀에 반납하지 않음)
+
+        Args:
+            sql: 실행할 SQL
+            batch_size: 서버에서 한 번에 가져올 행 수
+            partitioned: 날짜 파티션별 쿼리를 파티션 순서대로 이어서 반환할지 여부
+                (한 번에 연결 1개만 사용하므로 메모리는 배치 크기 수준 유지)
+
+        Yields:
+            list[dict] 배치 이터레이터
+        """
+        batches = self._iter_batches(sql, batch_size, partitioned)
         try:
-            with conn.cursor(pymysql.cursors.DictCursor) as cursor:
-                cursor.execute(sql)
-                return list(cursor.fetchall())
+            yield batches
         finally:
-            conn.close()
+            batches.close()
+
+    def _iter_batches(self, sql: str, batch_size: int, partitioned: bool) -> Iterator[list]:
+        """execute_iter용 배치 제너레이터 (파티션 쿼리는 순서대로 이어서 실행)"""
+        queries = [(sql, None)]
+        if self.partition_column_hint:
+            queries = [(self._add_partition_predicate(sql), None)]
+        elif partitioned:
+            partitions = self._detect_partitions(sql)
+            if len(partitions) > 1:
+                template, range_count = self._parameterize_date_range(sql)
+                queries = [
+                    (template, (partition["start"], partition["end"]) * range_count)
+                    for partition in partitions
+                ]
+
+        for query, params in queries:
+            with self._pool.connection() as conn:
+                cursor = conn.cursor(pymysql.cursors.SSDictCursor)
+                cursor.execute(query, params)
+                # 중간 종료(break / 예외로 GeneratorExit) 시 커서를 닫으면 남은 결과를 끝까지 읽으므로
+                # 커서는 다 읽은 경우에만 닫음 (읽다 만 연결은 풀에서 바로 폐기됨)
+                while batch := cursor.fetchmany(batch_size):
+                    yield batch
+                cursor.close()
 
     def execute_with_limit(self, sql: str, limit: int = 1000) -> dict:
         """
@@ -238,8 +606,54 @@ class ParallelExecutor:
         Returns:
             execute()와 동일한 형식
         """
+        start_ns = time.perf_counter_ns()
+
         # 이미 LIMIT이 있는지 확인
-        if not re.search(r"\bLIMIT\s+\d+", sql, re.IGNORECASE):
+        if not _LIMIT_RE.search(sql):
             sql = f"{sql.rstrip(';')} LIMIT {limit}"
 
-        return self.execute(sql, parallel=False)
+        # 파티션 감지 없이 바로 단일 실행 (미리보기는 행 수가 제한되므로 버퍼링 커서 사용,
+        # max_rows가 있으면 기존 LIMIT이 큰 경우를 위해 스트리밍으로 제한 확인)
+        try:
+            columns, rows = self._execute_single(sql, use_ss_cursor=self.max_rows is not None)
+            success, error = True, None
+        except Exception as e:
+            columns, rows = [], []
+            success, error = False, str(e)
+
+        return {
+            "success": success,
+            "data": self._format_rows(columns, rows),
+            "row_count": len(rows),
+            "error": error,
+            "execution_info": {
+                "parallel": False,
+                "partitions": 1 if success else 0,
+                "elapsed_ms": (time.perf_counter_ns() - start_ns) / 1e6,
+            },
+        }
+
+    def close(self):
+        """스레드 풀 / 이벤트 루프 / 연결 풀 종료 (실행 중인 파티션은 완료까지 대기)"""
+        with self._tpool_lock:
+            tpool, self._tpool = self._tpool, None
+        if tpool is not None:
+            tpool.shutdown(wait=True)
+
+        with self._portal_lock:
+            portal, portal_cm = self._portal, self._portal_cm
+            self._portal = self._portal_cm = None
+        if portal is not None:
+            try:
+                portal.call(self._close_async_pool)
+            finally:
+                self._apool = None
+                portal_cm.__exit__(None, None, None)
+
+        self._pool.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
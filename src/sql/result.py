@@ -0,0 +1,62 @@
+"""쿼리 결과 행 컨테이너 (열 단위 저장)"""
+
+from collections.abc import Sequence
+
+
+class ColumnarRows(Sequence):
+    """
+    쿼리 결과를 열 단위({컬럼: [값, ...]})로 보관하는 행 시퀀스
+
+    행마다 dict를 유지하지 않아 넓고 긴 결과의 메모리 사용이 줄어듭니다.
+    기존 list[dict]처럼 인덱싱/슬라이싱/순회할 수 있으며,
+    행 dict는 접근 시점에 생성됩니다.
+    """
+
+    __slots__ = ("columns", "_nrows")
+
+    def __init__(self, columns: dict[str, list], nrows: int):
+        """
+        Args:
+            columns: {컬럼명: 값 리스트} (모든 리스트 길이는 nrows)
+            nrows: 행 수
+        """
+        self.columns = columns
+        self._nrows = nrows
+
+    @classmethod
+    def from_records(cls, records: list[dict]) -> "ColumnarRows":
+        """list[dict] 결과를 열 단위로 변환"""
+        if not records:
+            return cls({}, 0)
+
+        columns = {key: [row[key] for row in records] for key in records[0]}
+        return cls(columns, len(records))
+
+    def __len__(self) -> int:
+        return self._nrows
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            keys = list(self.columns)
+            values = [col[index] for col in self.columns.values()]
+            return [dict(zip(keys, row)) for row in zip(*values)]
+
+        if index < 0:
+            index += self._nrows
+        if not 0 <= index < self._nrows:
+            raise IndexError("row index out of range")
+        return {key: col[index] for key, col in self.columns.items()}
+
+    def __iter__(self):
+        keys = list(self.columns)
+        for row in zip(*self.columns.values()):
+            yield dict(zip(keys, row))
+
+    def __repr__(self) -> str:
+        return f"ColumnarRows(columns={list(self.columns)}, nrows={self._nrows})"
+
+    def to_arrow(self):
+        """pyarrow.Table로 변환 (열 리스트를 그대로 사용)"""
+        import pyarrow as pa
+
+        return pa.Table.from_pydict(self.columns)
@@ -1,7 +1,29 @@
 """SQL 검증 모듈 - EXPLAIN 기반"""
 
+import threading
+from collections import OrderedDict
+
 import pymysql
-from typing import Optional
+
+from ._pool import ConnectionPool
+
+# EXPLAIN 검증용 연결 풀 크기 (동시 Tool 호출 수 기준)
+VALIDATOR_POOL_SIZE = 4
+
+# EXPLAIN 결과 캐시 크기 (공백 정규화한 SQL 기준 LRU)
+EXPLAIN_CACHE_SIZE = 512
+
+# 캐시하지 않는 일시적 오류 유형 (연결 끊김 등은 재시도 시 결과가 달라질 수 있음)
+_TRANSIENT_ERROR_TYPES = frozenset({"operational", "unknown"})
+
+# 에러 메시지 분류 규칙: (모두 포함해야 하는 소문자 문구들, 에러 유형) - 위에서부터 먼저 매칭
+_ERROR_RULES = (
+    (("unknown column",), "unknown_column"),
+    (("table", "doesn't exist"), "unknown_table"),
+    (("syntax",), "syntax_error"),
+    (("ambiguous",), "ambiguous_column"),
+    (("access denied",), "access_denied"),
+)
 
 
 class SQLValidator:
@@ -20,18 +42,18 @@ class SQLValidator:
                 }
         """
         self.config = connection_config
-        self._conn: Optional[pymysql.Connection] = None
-
-    def _get_connection(self) -> pymysql.Connection:
-        """DB 연결 반환 (lazy connection)"""
-        if self._conn is None or not self._conn.open:
-            self._conn = pymysql.connect(**self.config)
-        return self._conn
+        # 동시 Tool 호출(워커 스레드)마다 별도 연결 사용 (lazy 생성, 유휴 연결은 ping 후 재사용)
+        self._pool = ConnectionPool(connection_config, VALIDATOR_POOL_SIZE)
+        # 같은 SQL 재검증 시 EXPLAIN 왕복 생략 (정규화 SQL -> 검증 결과)
+        self._explain_cache: OrderedDict[str, dict] = OrderedDict()
+        self._cache_lock = threading.Lock()
 
     def validate(self, sql: str) -> dict:
         """
         SQL 쿼리 검증 (문법 + 테이블/컬럼 존재 여부)
 
+        이전에 검증한 SQL(공백 차이 무시)은 EXPLAIN 없이 캐시된 결과를 반환합니다.
+
         Args:
             sql: 검증할 SQL 쿼리
 
@@ -45,9 +67,8 @@ class SQLValidator:
                 }
             }
         """
-        # SELECT 쿼리만 허용
-        sql_stripped = sql.strip().upper()
-        if not sql_stripped.startswith("SELECT"):
+        # SELECT 쿼리만 허용 (앞 7자만 확인, SQL 전체를 대문자로 복사하지 않음)
+        if not self._starts_with_select(sql):
             return {
                 "is_valid": False,
                 "errors": {
@@ -57,15 +78,36 @@ class SQLValidator:
                 },
             }
 
+        # 공백만 다른 SQL은 같은 키로 취급
+        key = " ".join(sql.split())
+        with self._cache_lock:
+            cached = self._explain_cache.get(key)
+            if cached is not None:
+                self._explain_cache.move_to_end(key)
+        if cached is not None:
+            return dict(cached)  # 호출 측에서 suggestion 등을 추가하므로 복사본 반환
+
+        result = self._explain(sql)
+
+        if result["is_valid"] or result["errors"]["type"] not in _TRANSIENT_ERROR_TYPES:
+            with self._cache_lock:
+                self._explain_cache[key] = result
+                if len(self._explain_cache) > EXPLAIN_CACHE_SIZE:
+                    self._explain_cache.popitem(last=False)
+
+        return dict(result)
+
+    def _explain(self, sql: str) -> dict:
+        """EXPLAIN으로 SQL 검증 (validate 캐시 미스 시)"""
         try:
-            conn = self._get_connection()
-            with conn.cursor() as cursor:
-                # EXPLAIN으로 검증 (실제 실행 X)
-                cursor.execute(f"EXPLAIN {sql}")
-                return {
-                    "is_valid": True,
-                    "errors": None,
-                }
+            with self._pool.connection() as conn:
+                with conn.cursor() as cursor:
+                    # EXPLAIN으로 검증 (실제 실행 X)
+                    cursor.execute(f"EXPLAIN {sql}")
+            return {
+                "is_valid": True,
+                "errors": None,
+            }
 
         except pymysql.err.ProgrammingError as e:
             error_code, error_msg = e.args
@@ -99,22 +141,25 @@ class SQLValidator:
                 },
             }
 
+    @staticmethod
+    def _starts_with_select(sql: str) -> bool:
+        """SELECT 키워드로 시작하는지 확인 (SELECTX 같은 식별자는 제외)"""
+        head = sql.lstrip()[:7]
+        if head[:6].upper() != "SELECT":
+            return False
+        return len(head) == 6 or not (head[6].isalnum() or head[6] == "_")
+
     def _classify_error(self, msg: str) -> str:
-        """에러 메시지 유형 분류"""
+        """에러 메시지 유형 분류 (_ERROR_RULES 순서대로 매칭)"""
         msg_lower = msg.lower()
-
-        if "unknown column" in msg_lower:
-            return "unknown_column"
-        elif "table" in msg_lower and "doesn't exist" in msg_lower:
-            return "unknown_table"
-        elif "syntax" in msg_lower:
-            return "syntax_error"
-        elif "ambiguous" in msg_lower:
-            return "ambiguous_column"
-        elif "access denied" in msg_lower:
-            return "access_denied"
-        else:
-            return "other"
+        return next(
+            (
+                error_type
+                for phrases, error_type in _ERROR_RULES
+                if all(phrase in msg_lower for phrase in phrases)
+            ),
+            "other",
+        )
 
     def get_error_suggestion(self, error_type: str, error_msg: str) -> str:
         """
@@ -138,11 +183,15 @@ class SQLValidator:
 
         return suggestions.get(error_type, f"에러를 확인하세요: {error_msg}")
 
+    def clear_cache(self):
+        """EXPLAIN 결과 캐시 비우기 (스키마 변경 후 등)"""
+        with self._cache_lock:
+            self._explain_cache.clear()
+
     def close(self):
-        """연결 종료"""
-        if self._conn and self._conn.open:
-            self._conn.close()
-            self._conn = None
+        """연결 풀 종료 및 캐시 정리"""
+        self._pool.close()
+        self.clear_cache()
 
     def __enter__(self):
         return self